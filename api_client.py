@@ -0,0 +1,252 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Configuration (override with environment variables, e.g. to use mock_server.py)
+API_BASE_URL = os.environ.get("PULSE_API_BASE_URL", "https://dev.pulse-api.getpulseinsights.ai")
+API_BOT_URL = os.environ.get("PULSE_BOT_URL", "https://pulse-dev.scooby.getpulseinsights.ai")
+
+# Connection pool sizing per host (Streamlit serves many sessions from one process)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# (connect, read) timeouts in seconds for each endpoint
+CONNECT_TIMEOUT = 3.05
+ENDPOINT_TIMEOUTS = {
+    "init_intake": (CONNECT_TIMEOUT, 15),
+    "upload_file": (CONNECT_TIMEOUT, 120),
+    "upload_part": (CONNECT_TIMEOUT, 60),
+    "complete_upload": (CONNECT_TIMEOUT, 60),
+    "upload_text": (CONNECT_TIMEOUT, 60),
+    "get_intake_status": (CONNECT_TIMEOUT, 10),
+    "query_insights": (CONNECT_TIMEOUT, 90),
+    "finalize_intake": (CONNECT_TIMEOUT, 30),
+    "add_scooby_to_meeting": (CONNECT_TIMEOUT, 30),
+    "get_memories": (CONNECT_TIMEOUT, 15),
+}
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, 30)
+
+# Intake calls that are safe to resend: the intake status GET, and POSTs carrying an x-idempotency-key
+RETRY_ENDPOINTS = {"init_intake", "upload_file", "upload_part", "complete_upload", "upload_text", "get_intake_status"}
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# A host's circuit opens after this many consecutive failures and stays open for CIRCUIT_RESET_TIMEOUT seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _host_key(url: str) -> str:
+    """Return the scheme://host[:port] part of a URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def get_session(url: str) -> requests.Session:
+    """Get the shared keep-alive session for the host of the given URL"""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[key] = session
+    return session
+
+def get_timeout(endpoint: str) -> tuple:
+    """Get the (connect, read) timeout for an endpoint"""
+    return ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without contacting a host whose circuit breaker is open"""
+
+class CircuitBreaker:
+    """Fails fast after repeated failures of a host, then lets one probe request through"""
+
+    def __init__(self, host: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request to the host may be sent now"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    f"{self.host} is unavailable after {self.failures} consecutive failures; "
+                    f"retry in {max(remaining, 1):.0f}s"
+                )
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Get the circuit breaker shared by all requests to the host of the given URL"""
+    key = _host_key(url)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(key)
+        return breaker
+
+def circuit_states() -> dict:
+    """Current breaker state ("closed", "open" or "half-open") of every host contacted so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.state for breaker in breakers}
+
+def _replayable(kwargs: dict) -> bool:
+    """Whether the request body can be sent again (generators and plain iterators cannot)"""
+    data = kwargs.get("data")
+    if data is None or isinstance(data, (bytes, str, dict, list, tuple)):
+        return True
+    # Re-iterable bodies (MultipartFileStream, CompressedStream) start over on each iteration
+    return iter(data) is not data
+
+def _should_retry(endpoint: str, method: str, kwargs: dict) -> bool:
+    if endpoint not in RETRY_ENDPOINTS or not _replayable(kwargs):
+        return False
+    return method == "GET" or "x-idempotency-key" in (kwargs.get("headers") or {})
+
+def retry_delay(attempt: int, response: requests.Response = None) -> float:
+    """Backoff before retry number attempt (1-based): Retry-After if given, else exponential with full jitter"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+def _body_size(body) -> int:
+    """Size of a prepared request body, without consuming streamed bodies"""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+def _response_size(response: requests.Response, stream: bool) -> int:
+    """Size of a response body; streamed responses are counted from Content-Length"""
+    if stream:
+        return int(response.headers.get("Content-Length") or 0)
+    return len(response.content)
+
+def _send(endpoint: str, method: str, url: str, breaker: CircuitBreaker, **kwargs) -> requests.Response:
+    """Send one attempt, updating the host's circuit breaker and recording its metrics"""
+    # Checked before timing starts, so fail-fast rejections are not recorded as upstream calls
+    breaker.before_request()
+    with metrics.registry.timed(endpoint) as call:
+        try:
+            response = get_session(url).request(method, url, **kwargs)
+        except Exception:
+            # Any exception must end a half-open probe, or the breaker would stay open for good
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        call["status"] = response.status_code
+        call["request_bytes"] = _body_size(response.request.body)
+        call["response_bytes"] = _response_size(response, kwargs.get("stream", False))
+    return response
+
+def request(endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the pooled session for the URL's host, retrying idempotent intake calls"""
+    kwargs.setdefault("timeout", get_timeout(endpoint))
+    breaker = get_circuit_breaker(url)
+    attempts = RETRY_ATTEMPTS if _should_retry(endpoint, method, kwargs) else 1
+    for attempt in range(1, attempts + 1):
+        try:
+            response = _send(endpoint, method, url, breaker, **kwargs)
+        except CircuitOpenError:
+            raise
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == attempts:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == attempts:
+            return response
+        delay = retry_delay(attempt, response)
+        response.close()
+        time.sleep(delay)
+
+def get(endpoint: str, url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the shared client"""
+    return request(endpoint, "GET", url, **kwargs)
+
+def post(endpoint: str, url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the shared client"""
+    return request(endpoint, "POST", url, **kwargs)
+
+def close_sessions():
+    """Close all pooled sessions"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def iter_sse_data(response: requests.Response):
+    """Yield the data field of each server-sent event in a streamed response"""
+    response.encoding = "utf-8"  # SSE is always UTF-8
+    data_lines = []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+        elif line.startswith("data:"):
+            # A single space after the colon is part of the syntax, not the data
+            data_lines.append(line[6:] if line.startswith("data: ") else line[5:])
+    if data_lines:
+        yield "\n".join(data_lines)
@@ -0,0 +1,63 @@
+"""Compare single-POST and chunked parallel uploads against the local mock server.
+
+Run from the repository root with:
+    python -m benchmarks.bench_chunked_upload --size-mb 16 --latency 0.05 --error-rate 0.2
+"""
+import argparse
+import io
+import json
+import time
+import uuid
+
+import api_client
+from mock_server import start_mock_server
+from uploads import ChunkedUpload, MultipartFileStream, complete_chunked_upload, upload_parts
+
+def bench_single(base_url: str, data: bytes) -> float:
+    """Time one streamed multipart POST of the whole file"""
+    body = MultipartFileStream("file", "transcript.txt", io.BytesIO(data), "text/plain")
+    headers = {"x-idempotency-key": str(uuid.uuid4()), "Content-Type": body.content_type}
+    start = time.perf_counter()
+    response = api_client.post("upload_file", f"{base_url}/api/upload/file/bench", headers=headers, data=body)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return elapsed
+
+def bench_chunked(base_url: str, data: bytes, workers: int) -> dict:
+    """Time a chunked upload, resuming until every part is acknowledged"""
+    upload = ChunkedUpload(str(uuid.uuid4()), "transcript.txt", "text/plain", len(data))
+    file_url = f"{base_url}/api/upload/file/bench"
+    attempts = 0
+    start = time.perf_counter()
+    while True:
+        attempts += 1
+        upload_parts(upload, io.BytesIO(data), file_url, {}, max_workers=workers)
+        if upload.is_complete and complete_chunked_upload(upload, file_url, {}).status_code == 200:
+            break
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "attempts": attempts, "parts": upload.part_count}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    data = b"transcript line\n" * (args.size_mb * 1024 * 1024 // 16)
+    results = {"size_bytes": len(data), "latency": args.latency, "error_rate": args.error_rate}
+
+    # The single POST has no resume, so measure it without injected failures
+    server = start_mock_server(latency=args.latency)
+    results["single"] = bench_single(server.base_url, data)
+    server.shutdown()
+
+    server = start_mock_server(latency=args.latency, error_rate=args.error_rate)
+    results["chunked"] = {str(n): bench_chunked(server.base_url, data, n) for n in args.workers}
+    server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
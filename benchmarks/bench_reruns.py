@@ -0,0 +1,161 @@
+"""Measure the cost of one script rerun of the app, driven headlessly against the mock server.
+
+Run from the repository root with:
+    python -m benchmarks.bench_reruns --repeat 5 --output bench_reruns.json
+
+For every scenario it reports wall time per rerun, the number of elements
+emitted, the bytes of markdown and CSS sent, and the upstream calls made,
+as JSON so runs of different versions can be compared.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+from mock_server import start_mock_server
+
+APP_PATH = str(Path(__file__).resolve().parent.parent / "meeting_summary_app.py")
+LARGE_PASTE_BYTES = 2 * 1024 * 1024
+
+def _walk(node):
+    """Yield every element below a node of the AppTest element tree"""
+    for child in getattr(node, "children", {}).values():
+        yield child
+        yield from _walk(child)
+
+def _snapshot(at) -> dict:
+    """Count the elements and markdown/CSS bytes the last run emitted"""
+    elements = list(_walk(at._tree))
+    markdown = [m.value for m in at.markdown]
+    css = [value for value in markdown if "<style" in value or 'rel="stylesheet"' in value]
+    return {
+        "elements": len(elements),
+        "markdown_elements": len(markdown),
+        "markdown_bytes": sum(len(value.encode("utf-8")) for value in markdown),
+        "css_bytes": sum(len(value.encode("utf-8")) for value in css),
+    }
+
+def _calls_since(server, before: dict) -> dict:
+    after = dict(server.state.requests_by_endpoint)
+    return {name: count - before.get(name, 0) for name, count in after.items() if count != before.get(name, 0)}
+
+def measure(server, at, action, repeat: int) -> dict:
+    """Time action (which reruns the app) repeat times and summarize the last run"""
+    timings = []
+    calls = {}
+    for _ in range(repeat):
+        before = dict(server.state.requests_by_endpoint)
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+        for name, count in _calls_since(server, before).items():
+            calls[name] = calls.get(name, 0) + count
+    result = {
+        "reruns": repeat,
+        "mean_seconds": statistics.mean(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "upstream_calls_per_rerun": {name: count / repeat for name, count in calls.items()},
+        "exceptions": [str(e.value) for e in at.exception],
+    }
+    result.update(_snapshot(at))
+    return result
+
+def new_app():
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.run()
+    return at
+
+def signed_in_app():
+    at = new_app()
+    at.text_input(key="org_name_input").input("demo")
+    at.text_input(key="password_input").input("demo")
+    at.button[0].click().run()
+    at.run()
+    return at
+
+def scenario_login(server, repeat: int) -> dict:
+    """Submitting the login form"""
+    apps = [new_app() for _ in range(repeat)]
+    for at in apps:
+        at.text_input(key="org_name_input").input("demo")
+        at.text_input(key="password_input").input("demo")
+    pending = iter(apps)
+    state = {}
+
+    def submit():
+        state["at"] = next(pending)
+        state["at"].button[0].click().run()
+
+    result = measure(server, apps[0], submit, repeat)
+    result.update(_snapshot(state["at"]))
+    return result
+
+def scenario_login_page(server, repeat: int) -> dict:
+    """Idle rerun of the login page"""
+    at = new_app()
+    return measure(server, at, at.run, repeat)
+
+def scenario_section(section: str):
+    def run(server, repeat: int) -> dict:
+        at = signed_in_app()
+        at.radio(key="active_section").set_value(section).run()
+        return measure(server, at, at.run, repeat)
+    run.__doc__ = f"Idle rerun of the {section} section"
+    return run
+
+def scenario_history_paging(server, repeat: int) -> dict:
+    """Clicking Next in Intakes History"""
+    at = signed_in_app()
+    at.radio(key="active_section").set_value("Intakes History").run()
+    return measure(server, at, lambda: at.button(key="next_page").click().run(), repeat)
+
+def scenario_large_paste(server, repeat: int) -> dict:
+    """Idle rerun of the intake section with a large text paste present"""
+    at = signed_in_app()
+    at.button(key="init_btn").click().run()
+    text = ("Speaker 1: we agreed on the timeline and owners for next quarter.\n" * (LARGE_PASTE_BYTES // 66))
+    at.text_area(key="text_content_input").input(text).run()
+    return measure(server, at, at.run, repeat)
+
+SCENARIOS = {
+    "login_page": scenario_login_page,
+    "login": scenario_login,
+    "section_intake": scenario_section("Data Intake & Management"),
+    "section_history": scenario_section("Intakes History"),
+    "section_query": scenario_section("Query Insights"),
+    "section_meeting_assistant": scenario_section("Meeting Assistant"),
+    "history_paging": scenario_history_paging,
+    "large_paste": scenario_large_paste,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-rerun cost of the app")
+    parser.add_argument("--repeat", type=int, default=5, help="Reruns measured per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency per request")
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, memory_count=200)
+    for name in ("PULSE_API_BASE_URL", "PULSE_BOT_URL", "PULSE_SUPABASE_URL"):
+        os.environ[name] = server.base_url
+    os.environ.setdefault("PULSE_SUPABASE_ANON_KEY", "mock-anon-key")
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "repeat": args.repeat,
+        "latency": args.latency,
+        "scenarios": {name: SCENARIOS[name](server, args.repeat) for name in args.scenarios},
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Ingest a directory or glob of transcripts into Pulse without the Streamlit UI.
+
+Run from the repository root with, for example:
+    PULSE_ORG_ID=... PULSE_PASSWORD=... python bulk_ingest.py transcripts/ "notes/**/*.md"
+
+Files are split into intakes of --files-per-intake files. Up to --intakes
+intakes run at once; each one is initialized, receives its files over
+--uploads concurrent uploads and is finalized once all of them succeeded.
+Progress goes to stderr; a throughput summary (files/s, MB/s, failures) is
+printed to stdout at the end, as JSON with --json.
+"""
+import argparse
+import glob
+import json
+import mimetypes
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import intake_api
+from intake_api import generate_idempotency_key
+from upload_index import UploadIndex, find_duplicate, hash_file
+
+# Same formats as the app's file uploader
+INGEST_EXTENSIONS = (".txt", ".md", ".pdf", ".docx")
+# Sent through the text endpoint with --text
+TEXT_EXTENSIONS = (".txt", ".md")
+
+class LocalUpload:
+    """A file on disk with the name, type and size attributes of a Streamlit UploadedFile"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.size = os.path.getsize(path)
+        self._file = open(path, "rb")
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def collect_files(patterns: list, extensions: tuple = INGEST_EXTENSIONS) -> list:
+    """Files matching the given directories (searched recursively) and glob patterns, sorted and deduplicated"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in names)
+        else:
+            paths.update(glob.glob(pattern, recursive=True))
+    return sorted(path for path in paths if os.path.isfile(path) and path.lower().endswith(extensions))
+
+class IngestRun:
+    """Uploads files into intakes from worker pools and collects the outcome of each file and intake"""
+
+    def __init__(self, org_id: str, password: str, upload_workers: int, as_text: bool = False,
+                 index: Optional[UploadIndex] = None, skip_duplicates: bool = False):
+        self.org_id = org_id
+        self.password = password
+        self.upload_workers = upload_workers
+        self.as_text = as_text
+        self.index = index
+        self.skip_duplicates = skip_duplicates
+        self.files = []
+        self.intakes = []
+        self._lock = threading.Lock()
+
+    def _report(self, line: str):
+        # Progress goes to stderr so stdout holds only the summary
+        with self._lock:
+            print(line, file=sys.stderr, flush=True)
+
+    def upload_one(self, intake_id: str, path: str) -> dict:
+        """Upload one file into the intake and return its outcome"""
+        result = {"path": path, "intake_id": intake_id, "bytes": 0, "status": "failed", "error": None}
+        try:
+            with LocalUpload(path) as local_file:
+                result["bytes"] = local_file.size
+                content_hash = hash_file(local_file) if self.index else None
+                if self.skip_duplicates:
+                    kind, _ = find_duplicate(self.index.lookup(self.org_id, content_hash), intake_id)
+                    if kind in ("same_intake", "finalized"):
+                        result["status"] = "skipped"
+                        return result
+
+                if self.as_text and path.lower().endswith(TEXT_EXTENSIONS):
+                    text = local_file.read().decode("utf-8")
+                    success, error = intake_api.upload_text(intake_id, text, self.org_id, self.password,
+                                                            generate_idempotency_key())
+                else:
+                    success, error = intake_api.upload_file(intake_id, local_file, self.org_id, self.password,
+                                                            generate_idempotency_key())
+            if success:
+                result["status"] = "uploaded"
+                if self.index:
+                    self.index.record(self.org_id, content_hash, intake_id, os.path.basename(path), result["bytes"])
+            else:
+                result["error"] = error
+        except Exception as e:
+            result["error"] = f"Error uploading file: {str(e)}"
+        return result
+
+    def ingest_intake(self, paths: list) -> dict:
+        """Run init -> uploads -> finalize for one group of files"""
+        intake = {"intake_id": None, "files": len(paths), "finalized": False, "error": None}
+        intake_id, error = intake_api.init_intake(self.org_id, self.password, generate_idempotency_key())
+        if error:
+            intake["error"] = error
+            for path in paths:
+                self._record({"path": path, "intake_id": None, "bytes": os.path.getsize(path), "status": "failed", "error": error})
+            return intake
+        intake["intake_id"] = intake_id
+
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.upload_workers, len(paths))) as executor:
+            futures = [executor.submit(self.upload_one, intake_id, path) for path in paths]
+            for future in as_completed(futures):
+                results.append(self._record(future.result()))
+
+        failed = [r for r in results if r["status"] == "failed"]
+        if failed:
+            intake["error"] = f"{len(failed)} of {len(paths)} uploads failed; intake left open"
+        elif any(r["status"] == "uploaded" for r in results):
+            success, error = intake_api.finalize_intake(intake_id, self.org_id, self.password)
+            intake["finalized"] = success
+            intake["error"] = error
+            if success and self.index:
+                self.index.mark_finalized(self.org_id, intake_id)
+        if intake["finalized"]:
+            self._report(f"✓ intake {intake_id}: finalized")
+        elif intake["error"]:
+            self._report(f"✗ intake {intake_id}: {intake['error']}")
+        else:
+            self._report(f"- intake {intake_id}: nothing uploaded, not finalized")
+        return intake
+
+    def _record(self, result: dict) -> dict:
+        with self._lock:
+            self.files.append(result)
+        if result["status"] == "uploaded":
+            self._report(f"  ↑ {result['path']} ({result['bytes'] / (1024 * 1024):.2f} MB)")
+        elif result["status"] == "skipped":
+            self._report(f"  - {result['path']}: already uploaded, skipped")
+        else:
+            self._report(f"  ✗ {result['path']}: {result['error']}")
+        return result
+
+    def run(self, paths: list, files_per_intake: int, intake_workers: int) -> float:
+        """Ingest all paths and return the elapsed seconds"""
+        groups = [paths[i:i + files_per_intake] for i in range(0, len(paths), files_per_intake)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(intake_workers, len(groups)))) as executor:
+            for future in as_completed([executor.submit(self.ingest_intake, group) for group in groups]):
+                self.intakes.append(future.result())
+        return time.perf_counter() - start
+
+def summarize(run: IngestRun, elapsed: float) -> dict:
+    """Throughput and failure counts of a finished run"""
+    uploaded = [f for f in run.files if f["status"] == "uploaded"]
+    uploaded_bytes = sum(f["bytes"] for f in uploaded)
+    return {
+        "files": len(run.files),
+        "uploaded": len(uploaded),
+        "skipped": sum(1 for f in run.files if f["status"] == "skipped"),
+        "failed": sum(1 for f in run.files if f["status"] == "failed"),
+        "intakes": len(run.intakes),
+        "intakes_finalized": sum(1 for i in run.intakes if i["finalized"]),
+        "bytes": uploaded_bytes,
+        "seconds": elapsed,
+        "files_per_second": len(uploaded) / elapsed if elapsed else 0.0,
+        "mb_per_second": uploaded_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+        "failures": [{"path": f["path"], "error": f["error"]} for f in run.files if f["status"] == "failed"],
+    }
+
+def print_summary(summary: dict):
+    print()
+    print(f"Uploaded {summary['uploaded']} of {summary['files']} files "
+          f"({summary['bytes'] / (1024 * 1024):.1f} MB) in {summary['seconds']:.1f}s; "
+          f"{summary['intakes_finalized']} of {summary['intakes']} intakes finalized")
+    print(f"Throughput: {summary['files_per_second']:.2f} files/s, {summary['mb_per_second']:.2f} MB/s")
+    print(f"Skipped: {summary['skipped']}  Failed: {summary['failed']}")
+    for failure in summary["failures"]:
+        print(f"  {failure['path']}: {failure['error']}")
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest transcripts into Pulse without the UI")
+    parser.add_argument("paths", nargs="+", help="Directories (searched recursively) or glob patterns")
+    parser.add_argument("--org-id", default=os.environ.get("PULSE_ORG_ID"), help="Organization id (default: $PULSE_ORG_ID)")
+    parser.add_argument("--password", default=os.environ.get("PULSE_PASSWORD"), help="Organization password (default: $PULSE_PASSWORD)")
+    parser.add_argument("--files-per-intake", type=int, default=10, help="Files uploaded into each intake")
+    parser.add_argument("--intakes", type=int, default=2, help="Intakes processed concurrently")
+    parser.add_argument("--uploads", type=int, default=4, help="Concurrent uploads per intake")
+    parser.add_argument("--text", action="store_true", help="Send .txt/.md files through the text endpoint")
+    parser.add_argument("--skip-duplicates", action="store_true", help="Skip content already uploaded into a finalized intake")
+    parser.add_argument("--no-index", action="store_true", help="Neither read nor update the local upload index")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.org_id or not args.password:
+        parser.error("--org-id and --password (or PULSE_ORG_ID and PULSE_PASSWORD) are required")
+    if args.skip_duplicates and args.no_index:
+        parser.error("--skip-duplicates needs the upload index")
+    if min(args.files_per_intake, args.intakes, args.uploads) < 1:
+        parser.error("--files-per-intake, --intakes and --uploads must be at least 1")
+
+    paths = collect_files(args.paths)
+    if not paths:
+        print(f"No {', '.join(INGEST_EXTENSIONS)} files found", file=sys.stderr)
+        return 1
+
+    index = None if args.no_index else UploadIndex()
+    run = IngestRun(args.org_id, args.password, args.uploads, args.text, index, args.skip_duplicates)
+    elapsed = run.run(paths, args.files_per_intake, args.intakes)
+    summary = summarize(run, elapsed)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+    return 1 if summary["failed"] or any(intake["error"] for intake in run.intakes) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Intake calls of the Pulse API without Streamlit state, shared by the app and bulk_ingest.py.
+
+Each function takes the org credentials explicitly and returns (result, error)
+instead of rendering messages, so callers decide how to report failures.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import api_client
+from api_client import API_BASE_URL
+from uploads import (
+    ChunkedUpload,
+    complete_chunked_upload,
+    post_file,
+    post_text,
+    upload_parts,
+    use_chunked_upload,
+)
+
+def generate_idempotency_key():
+    """Generate a unique idempotency key"""
+    return str(uuid.uuid4())
+
+def intake_headers(org_id, password, idempotency_key: Optional[str] = None) -> dict:
+    """Headers authenticating an intake call, with an idempotency key when given"""
+    headers = {
+        "x-org-id": str(org_id),
+        "Authorization": f"Bearer {password}"
+    }
+    if idempotency_key:
+        headers["x-idempotency-key"] = idempotency_key
+    return headers
+
+def init_intake(org_id, password, idempotency_key: str) -> tuple[Optional[str], Optional[str]]:
+    """Initialize a new intake, returning (intake_id, error)"""
+    try:
+        headers = intake_headers(org_id, password, idempotency_key)
+        response = api_client.post("init_intake", f"{API_BASE_URL}/api/intakes/init", headers=headers)
+
+        if response.status_code == 200:
+            return response.json().get("intake_id"), None
+        else:
+            return None, f"Failed to initialize intake: {response.status_code}"
+    except Exception as e:
+        return None, f"Error initializing intake: {str(e)}"
+
+def new_chunked_upload(uploaded_file, idempotency_key: str) -> ChunkedUpload:
+    """Resumable part-upload state for a large file, identified by its idempotency key"""
+    return ChunkedUpload(idempotency_key, uploaded_file.name, uploaded_file.type, uploaded_file.size)
+
+def upload_file(intake_id: str, uploaded_file, org_id, password, idempotency_key: str,
+                chunked_upload: Optional[ChunkedUpload] = None) -> tuple[bool, Optional[str]]:
+    """Upload a file (name, type, size, read/seek) to the intake, returning (success, error)"""
+    try:
+        headers = intake_headers(org_id, password, idempotency_key)
+        file_url = f"{API_BASE_URL}/api/upload/file/{intake_id}"
+
+        if use_chunked_upload(file_url, uploaded_file.size):
+            # Passing the ChunkedUpload of a failed attempt resumes it from the parts already acknowledged
+            upload = chunked_upload or new_chunked_upload(uploaded_file, idempotency_key)
+            errors = upload_parts(upload, uploaded_file, file_url, headers)
+            if not upload.unsupported:
+                if errors:
+                    return False, (f"Failed to upload {len(errors)} of {upload.part_count} parts. Upload again to resume.\n"
+                                   + "\n".join(sorted(errors)))
+                response = complete_chunked_upload(upload, file_url, headers)
+                if response.status_code == 200:
+                    return True, None
+                return False, f"Failed to complete file upload: {response.status_code}"
+            # The server has no part API: send the whole file in one request below
+
+        # Text files are sent compressed, others are streamed in chunks instead of buffered with getvalue()
+        response = post_file(file_url, uploaded_file, headers)
+
+        if response.status_code == 200:
+            return True, None
+        else:
+            return False, f"Failed to upload file: {response.status_code}"
+    except Exception as e:
+        return False, f"Error uploading file: {str(e)}"
+
+BATCH_UPLOAD_WORKERS = 4
+
+def upload_files_concurrently(intake_id: str, uploaded_files: list, org_id, password, idempotency_keys: list,
+                              max_workers: int = BATCH_UPLOAD_WORKERS):
+    """Upload files from a worker pool, yielding (index, success, message) as each one finishes"""
+    if not uploaded_files:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(uploaded_files))) as executor:
+        futures = {
+            executor.submit(upload_file, intake_id, uploaded_file, org_id, password, key): index
+            for index, (uploaded_file, key) in enumerate(zip(uploaded_files, idempotency_keys))
+        }
+        for future in as_completed(futures):
+            success, error = future.result()
+            yield futures[future], success, "Uploaded" if success else error.split("\n", 1)[0]
+
+def upload_text(intake_id: str, text_content: str, org_id, password, idempotency_key: str) -> tuple[bool, Optional[str]]:
+    """Upload text content to the intake, returning (success, error)"""
+    try:
+        headers = intake_headers(org_id, password, idempotency_key)
+        response = post_text(f"{API_BASE_URL}/api/upload/text/{intake_id}", text_content, headers)
+
+        if response.status_code == 200:
+            return True, None
+        else:
+            return False, f"Failed to upload text: {response.status_code}"
+    except Exception as e:
+        return False, f"Error uploading text: {str(e)}"
+
+def fetch_intake_status(intake_id: str, org_id, password) -> tuple[Optional[dict], Optional[str]]:
+    """Fetch the status of an intake, returning (status, error)"""
+    try:
+        headers = intake_headers(org_id, password)
+        response = api_client.get("get_intake_status", f"{API_BASE_URL}/api/intakes/{intake_id}", headers=headers)
+
+        if response.status_code == 200:
+            return response.json(), None
+        else:
+            return None, f"Failed to get intake status: {response.status_code}"
+    except Exception as e:
+        return None, f"Error getting intake status: {str(e)}"
+
+def finalize_intake(intake_id: str, org_id, password) -> tuple[bool, Optional[str]]:
+    """Finalize the intake, returning (success, error)"""
+    try:
+        headers = intake_headers(org_id, password)
+        response = api_client.post("finalize_intake", f"{API_BASE_URL}/api/intakes/{intake_id}/finalize", headers=headers)
+
+        if response.status_code == 200:
+            return True, None
+        else:
+            return False, f"Failed to finalize intake: {response.status_code}"
+    except Exception as e:
+        return False, f"Error finalizing intake: {str(e)}"
@@ -1,188 +1,272 @@
 import streamlit as st
-import requests
+import functools
+import hashlib
+import html
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 import pytz
+import api_client
+from api_client import API_BASE_URL
+from cache import TTLCache
 
-# Configuration
-API_BASE_URL = "https://dev.pulse-api.getpulseinsights.ai"
+# Memory pages are cached per (org_id, page, page_size) across reruns and sessions
+MEMORIES_CACHE_TTL = 60
+MEMORIES_CACHE_MAX_ENTRIES = 256
+memories_cache = TTLCache(ttl=MEMORIES_CACHE_TTL, max_entries=MEMORIES_CACHE_MAX_ENTRIES)
+
+# Timezone memory timestamps are displayed in
+DISPLAY_TIMEZONE = "UTC"
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(name=DISPLAY_TIMEZONE):
+    """Get a timezone object, created once per name"""
+    return pytz.timezone(name)
+
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp(timestamp_str) -> Optional[datetime]:
+    """Parse an ISO timestamp from the API, memoized by the raw string"""
+    try:
+        return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def format_relative(dt, now):
+    """Format the time between dt and now (e.g., '2 minutes ago')"""
+    diff = now - dt
+    
+    if diff.days > 0:
+        if diff.days == 1:
+            return "1 day ago"
+        else:
+            return f"{diff.days} days ago"
+    elif diff.seconds >= 3600:
+        hours = diff.seconds // 3600
+        if hours == 1:
+            return "1 hour ago"
+        else:
+            return f"{hours} hours ago"
+    elif diff.seconds >= 60:
+        minutes = diff.seconds // 60
+        if minutes == 1:
+            return "1 minute ago"
+        else:
+            return f"{minutes} minutes ago"
+    else:
+        return "Just now"
+
+def format_timestamps(timestamp_strs, now=None, tz_name=DISPLAY_TIMEZONE):
+    """Format a page of timestamps to relative time against a single reference time"""
+    local_tz = get_timezone(tz_name)
+    if now is None:
+        now = datetime.now(local_tz)
+    
+    formatted = []
+    for timestamp_str in timestamp_strs:
+        dt = parse_timestamp(timestamp_str)
+        formatted.append(format_relative(dt.astimezone(local_tz), now) if dt is not None else "Unknown time")
+    return formatted
 
 def format_timestamp(timestamp_str):
     """Format timestamp to relative time (e.g., '2 minutes ago')"""
+    return format_timestamps([timestamp_str])[0]
+
+# Adjacent pages are prefetched in the background so Next/Previous hit the cache
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="memories-prefetch")
+_inflight = {}
+_inflight_lock = threading.Lock()
+_cache_generation = 0
+
+class MemoriesFetchError(Exception):
+    """Raised when /api/memories answers with a non-200 status"""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"Failed to fetch memories: {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+def invalidate_memories_cache(org_id=None):
+    """Drop cached memory pages for one organization, or for all of them"""
+    global _cache_generation
+    with _inflight_lock:
+        _cache_generation += 1
+    if org_id is None:
+        memories_cache.invalidate()
+    else:
+        memories_cache.invalidate(lambda key: key[0] == str(org_id))
+
+def _fetch_memories_page(org_id, page, page_size):
+    """Fetch one page from the API and cache it; safe to call off the script thread"""
+    with _inflight_lock:
+        generation = _cache_generation
+    
+    headers = {"x-org-id": org_id}
+    url = f"{API_BASE_URL}/api/memories"
+    params = {"page": page, "page_size": page_size}
+    
+    response = api_client.get("get_memories", url, params=params, headers=headers)
+    if response.status_code != 200:
+        raise MemoriesFetchError(response.status_code, response.text)
+    
+    data = response.json()
+    with _inflight_lock:
+        # Don't repopulate the cache with a page fetched before an invalidation
+        if generation == _cache_generation:
+            memories_cache.set((str(org_id), page, page_size), data)
+    return data
+
+def _fetch_memories_shared(org_id, page, page_size) -> Future:
+    """Start a page fetch, or join the one already in flight for the same page"""
+    cache_key = (str(org_id), page, page_size)
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        if future is None:
+            future = _prefetch_executor.submit(_fetch_memories_page, org_id, page, page_size)
+            _inflight[cache_key] = future
+            future.add_done_callback(lambda f: _forget_inflight(cache_key, f))
+    return future
+
+def _fetch_memories_foreground(org_id, page, page_size):
+    """Fetch the page being viewed on the calling thread, joining a fetch already in flight for it"""
+    # Not submitted to the prefetch pool: the visible page must not queue behind other sessions' prefetches
+    cache_key = (str(org_id), page, page_size)
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        joining = future is not None
+        if not joining:
+            future = Future()
+            _inflight[cache_key] = future
+    if joining:
+        return future.result()
+    
     try:
-        # Parse the timestamp
-        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        
-        # Convert to local timezone
-        local_tz = pytz.timezone('UTC')  # You can change this to your local timezone
-        dt = dt.astimezone(local_tz)
-        
-        # Calculate time difference
-        now = datetime.now(local_tz)
-        diff = now - dt
-        
-        if diff.days > 0:
-            if diff.days == 1:
-                return "1 day ago"
-            else:
-                return f"{diff.days} days ago"
-        elif diff.seconds >= 3600:
-            hours = diff.seconds // 3600
-            if hours == 1:
-                return "1 hour ago"
-            else:
-                return f"{hours} hours ago"
-        elif diff.seconds >= 60:
-            minutes = diff.seconds // 60
-            if minutes == 1:
-                return "1 minute ago"
-            else:
-                return f"{minutes} minutes ago"
-        else:
-            return "Just now"
-    except:
-        return "Unknown time"
+        data = _fetch_memories_page(org_id, page, page_size)
+        future.set_result(data)
+        return data
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _forget_inflight(cache_key, future)
+
+def _forget_inflight(cache_key, future):
+    with _inflight_lock:
+        if _inflight.get(cache_key) is future:
+            del _inflight[cache_key]
+
+def prefetch_memories(org_id, page, page_size):
+    """Warm the cache for a page in the background if it isn't cached already"""
+    if page < 1 or memories_cache.get((str(org_id), page, page_size)) is not None:
+        return
+    _fetch_memories_shared(org_id, page, page_size)
 
 def get_memories(org_id, page=1, page_size=15):
-    """Fetch memories from the API"""
+    """Fetch memories from the API, reusing a cached or prefetched page when available"""
+    cached = memories_cache.get((str(org_id), page, page_size))
+    if cached is not None:
+        return cached
+    
     try:
-        headers = {"x-org-id": org_id}
-        url = f"{API_BASE_URL}/api/memories"
-        params = {"page": page, "page_size": page_size}
-        
-        response = requests.get(url, params=params, headers=headers)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Failed to fetch memories: {response.status_code}")
-            st.error(f"Response: {response.text}")
-            return None
+        return _fetch_memories_foreground(org_id, page, page_size)
+    except MemoriesFetchError as e:
+        st.error(f"Failed to fetch memories: {e.status_code}")
+        st.error(f"Response: {e.text}")
+        return None
     except Exception as e:
         st.error(f"Error fetching memories: {str(e)}")
         return None
 
-def render_memory_card(memory, index):
-    """Render a single memory card using Streamlit native components"""
-    # Extract memory data
+# Page templates, built once at import; one page is sent as a single markdown element.
+# Kept on one line each so the markdown parser treats the whole page as one HTML block.
+MEMORY_CARD_TEMPLATE = (
+    '<div class="memory-card"><div class="memory-card-body">'
+    '<div class="memory-icon">{icon}</div>'
+    '<div class="memory-content">'
+    '<div class="memory-title">{title}</div>'
+    '<div class="memory-summary">{summary}</div>'
+    '<div class="memory-footer"><div class="memory-timestamp">🕒 {time_ago}</div></div>'
+    '</div></div></div>'
+)
+MEMORY_PAGE_TEMPLATE = (
+    '<div class="memory-page">'
+    '<div class="memory-page-info"><span>Page {page} of {total_pages} • Showing {count} of {total_count} memories</span></div>'
+    '<div class="memory-list">{cards}</div>'
+    '</div>'
+)
+
+def _escape_text(value) -> str:
+    """HTML-escape API text and keep line breaks without ending the HTML block"""
+    return html.escape(str(value)).replace("\r\n", "\n").replace("\n", "<br>")
+
+# Memory icons by keyword, in priority order; matched as substrings of title or summary
+MEMORY_ICONS = {
+    'meeting': '📅',
+    'email': '📧',
+    'document': '📄',
+    'conversation': '💬',
+    'decision': '✅',
+    'note': '📝'
+}
+DEFAULT_MEMORY_ICON = '🧠'
+_ICON_PRIORITY = list(MEMORY_ICONS)
+# Zero-width lookahead, so overlapping keywords ("keynotemail") are all found in one scan
+_ICON_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, MEMORY_ICONS)) + "))")
+
+# Icons memoized by memory id (or by a hash of the content when there is no id)
+MEMORY_ICON_CACHE_TTL = 60 * 60
+MEMORY_ICON_CACHE_MAX_ENTRIES = 4096
+memory_icon_cache = TTLCache(ttl=MEMORY_ICON_CACHE_TTL, max_entries=MEMORY_ICON_CACHE_MAX_ENTRIES)
+
+def classify_memory_icon(title, summary):
+    """Pick the icon of the highest-priority keyword found in the title or summary"""
+    found = set(_ICON_PATTERN.findall(title.lower()))
+    found.update(_ICON_PATTERN.findall(summary.lower()))
+    if not found:
+        return DEFAULT_MEMORY_ICON
+    return MEMORY_ICONS[min(found, key=_ICON_PRIORITY.index)]
+
+def _content_key(title, summary) -> str:
+    """Digest of a memory's text, so the cache does not keep long summaries alive"""
+    return hashlib.sha256(f"{title}\0{summary}".encode("utf-8")).hexdigest()
+
+def memory_icon(memory, title, summary):
+    """Icon for a memory, classified once and then served from the cache"""
+    memory_id = memory.get('id')
+    cache_key = ('id', memory_id) if memory_id is not None else ('content', _content_key(title, summary))
+    icon = memory_icon_cache.get(cache_key)
+    if icon is None:
+        icon = classify_memory_icon(title, summary)
+        memory_icon_cache.set(cache_key, icon)
+    return icon
+
+def render_memory_card_html(memory, time_ago):
+    """Build the HTML for a single memory card"""
     title = memory.get('title', 'Untitled Memory')
     summary = memory.get('summary', 'No summary available')
-    created_at = memory.get('created_at', '')
-    
-    # Format timestamp
-    time_ago = format_timestamp(created_at)
-    
-    # Create icon based on memory type or use default
-    icon_map = {
-        'meeting': '📅',
-        'email': '📧',
-        'document': '📄',
-        'conversation': '💬',
-        'decision': '✅',
-        'note': '📝'
-    }
     
-    # Try to determine icon from title or summary
-    icon = '🧠'  # Default brain icon
-    for key, emoji in icon_map.items():
-        if key.lower() in title.lower() or key.lower() in summary.lower():
-            icon = emoji
-            break
-    
-    # Create the memory card using a single HTML structure
-    st.markdown(f"""
-    <div class="memory-card">
-        <div style="display: flex; align-items: flex-start; gap: 1rem;">
-            <div class="memory-icon">{icon}</div>
-            <div style="flex: 1; min-width: 0;">
-                <div class="memory-title">{title}</div>
-                <div class="memory-summary">{summary}</div>
-                <div style="margin-top: 1rem;">
-                    <div class="memory-timestamp">🕒 {time_ago}</div>
-                </div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    return MEMORY_CARD_TEMPLATE.format(
+        icon=memory_icon(memory, title, summary),
+        title=_escape_text(title),
+        summary=_escape_text(summary),
+        time_ago=time_ago
+    )
+
+def render_memories_page(memories, page, total_pages, total_count):
+    """Render a whole page of memory cards as one markdown element"""
+    times_ago = format_timestamps([memory.get('created_at', '') for memory in memories])
+    cards = "".join(render_memory_card_html(memory, time_ago) for memory, time_ago in zip(memories, times_ago))
+    st.markdown(MEMORY_PAGE_TEMPLATE.format(
+        page=page,
+        total_pages=total_pages,
+        count=len(memories),
+        total_count=total_count,
+        cards=cards
+    ), unsafe_allow_html=True)
 
 def intakes_history_tab():
     """Main function for the Intakes History tab"""
-    # Add custom CSS for better card styling
-    st.markdown("""
-    <style>
-    .memory-card {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-        transition: all 0.2s ease;
-    }
-    
-    .memory-card:hover {
-        transform: translateY(-2px);
-        box-shadow: var(--shadow-md);
-    }
-    
-    .memory-icon {
-        background: var(--primary-light);
-        color: var(--primary);
-        width: 48px;
-        height: 48px;
-        border-radius: var(--radius);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.5rem;
-        margin-top: 0.5rem;
-        flex-shrink: 0;
-    }
-    
-    .memory-title {
-        font-size: 1.1rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin-bottom: 0.5rem;
-        line-height: 1.4;
-    }
-    
-    .memory-summary {
-        color: var(--text-secondary);
-        font-size: 0.875rem;
-        line-height: 1.5;
-        margin-bottom: 1rem;
-    }
-    
-    .memory-timestamp {
-        color: var(--text-muted);
-        font-size: 0.75rem;
-        display: flex;
-        align-items: center;
-        gap: 0.25rem;
-    }
-    
-    /* Control alignment and button styling */
-    .stButton > button {
-        height: 38px !important;
-        border-radius: var(--radius-lg) !important;
-        font-weight: 500 !important;
-        transition: all 0.2s ease !important;
-    }
-    
-    .stButton > button:disabled {
-        background: var(--bg-tertiary) !important;
-        color: var(--text-muted) !important;
-        border: 1px solid var(--border-light) !important;
-        cursor: not-allowed !important;
-        opacity: 0.6 !important;
-    }
-    
-    .stButton > button:disabled:hover {
-        transform: none !important;
-        box-shadow: none !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
     st.markdown("""
     <div class="card">
         <div class="card-header">
@@ -229,6 +313,7 @@ def intakes_history_tab():
         
         with col1:
             if st.button("Refresh", key="refresh_memories", use_container_width=True):
+                invalidate_memories_cache(org_id)
                 st.rerun()
         
         with col2:
@@ -242,29 +327,13 @@ def intakes_history_tab():
                 st.rerun()
         
         if memories:
-            # Display pagination info
-            st.markdown(f"""
-            <div style="
-                background: var(--bg-tertiary);
-                border: 1px solid var(--border-light);
-                border-radius: var(--radius);
-                padding: 1rem;
-                margin-bottom: 1.5rem;
-                text-align: center;
-            ">
-                <span style="color: var(--text-secondary); font-size: 0.875rem;">
-                    Page {current_page} of {total_pages} • Showing {len(memories)} of {total_count} memories
-                </span>
-            </div>
-            """, unsafe_allow_html=True)
+            render_memories_page(memories, current_page, total_pages, total_count)
             
-            # Render each memory
-            for i, memory in enumerate(memories):
-                render_memory_card(memory, i)
-                
-                # Add some spacing between cards
-                if i < len(memories) - 1:
-                    st.markdown("<br>", unsafe_allow_html=True)
+            # Warm the adjacent pages now that this one is on screen
+            if has_next:
+                prefetch_memories(org_id, current_page + 1, page_size)
+            if has_prev:
+                prefetch_memories(org_id, current_page - 1, page_size)
         else:
             st.markdown("""
             <div style="
@@ -1,545 +1,123 @@
 import streamlit as st
-import requests
-import uuid
+import os
 import time
 import json
+from datetime import datetime, timezone
 from typing import Optional
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
-from intakes_history import intakes_history_tab
+import api_client
+import intake_api
+import metrics
+from api_client import API_BASE_URL, API_BOT_URL
+from intake_api import fetch_intake_status, generate_idempotency_key
+from intakes_history import format_relative, intakes_history_tab, invalidate_memories_cache
+from query_cache import cache_answer, get_cached_answer, invalidate_answer_cache
+from query_batch import MAX_BATCH_QUESTIONS, ask_questions_concurrently, parse_questions
+from query_history import QueryHistoryStore, answer_text
+from status_watcher import IntakeStatusWatcher
+from styles import inject_styles
+from text_stats import text_stats
+from upload_index import UploadIndex, find_duplicate, hash_file, hash_text
+from uploads import CHUNKED_UPLOAD_THRESHOLD, CHUNKED_UPLOADS_ENABLED
 
-# Configuration
-API_BASE_URL = "https://dev.pulse-api.getpulseinsights.ai"
-API_BOT_URL = "https://pulse-dev.scooby.getpulseinsights.ai"
+# Seconds between redraws of the live intake status region
+STATUS_REFRESH_INTERVAL = 1
 
-# Supabase Configuration
-SUPABASE_URL = st.secrets.get("SUPABASE_URL", "your-supabase-url")
-SUPABASE_KEY = st.secrets.get("SUPABASE_ANON_KEY", "your-supabase-anon-key")
+# Supabase Configuration (override with PULSE_SUPABASE_* environment variables, e.g. to use mock_server.py).
+# Not SUPABASE_*: loading st.secrets copies root-level secrets into os.environ under those names.
+SUPABASE_URL = os.environ.get("PULSE_SUPABASE_URL") or st.secrets.get("SUPABASE_URL", "your-supabase-url")
+SUPABASE_KEY = os.environ.get("PULSE_SUPABASE_ANON_KEY") or st.secrets.get("SUPABASE_ANON_KEY", "your-supabase-anon-key")
+
+# Metrics: Prometheus endpoint port and the in-app admin panel (both off by default)
+METRICS_PORT = os.environ.get("PULSE_METRICS_PORT")
+SHOW_METRICS_PANEL = os.environ.get("PULSE_SHOW_METRICS", "").lower() in ("1", "true", "yes")
 
 @st.cache_resource
 def init_supabase() -> Client:
     """Initialize Supabase client"""
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def load_modern_css():
-    """Load clean, professional CSS with minimal design"""
-    st.markdown("""
-    <style>
-    /* Import clean fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap');
-    
-    /* Color System */
-    :root {
-        /* Light theme colors */
-        --primary: #2563eb;
-        --primary-hover: #1d4ed8;
-        --primary-light: #dbeafe;
-        --primary-dark: #1e40af;
-        
-        --gray-50: #f9fafb;
-        --gray-100: #f3f4f6;
-        --gray-200: #e5e7eb;
-        --gray-300: #d1d5db;
-        --gray-400: #9ca3af;
-        --gray-500: #6b7280;
-        --gray-600: #4b5563;
-        --gray-700: #374151;
-        --gray-800: #1f2937;
-        --gray-900: #111827;
-        
-        --success: #10b981;
-        --success-light: #d1fae5;
-        --warning: #f59e0b;
-        --warning-light: #fef3c7;
-        --error: #ef4444;
-        --error-light: #fee2e2;
-        
-        --bg-primary: #ffffff;
-        --bg-secondary: #f9fafb;
-        --bg-tertiary: #f3f4f6;
-        --text-primary: #111827;
-        --text-secondary: #374151;
-        --text-muted: #6b7280;
-        --border: #e5e7eb;
-        --border-light: #f3f4f6;
-        
-        --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-        --shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06);
-        --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-        
-        --radius-sm: 4px;
-        --radius: 6px;
-        --radius-lg: 8px;
-        --radius-xl: 12px;
-    }
-    
-    /* Dark theme */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --bg-primary: #111827;
-            --bg-secondary: #1f2937;
-            --bg-tertiary: #374151;
-            --text-primary: #f9fafb;
-            --text-secondary: #d1d5db;
-            --text-muted: #9ca3af;
-            --border: #374151;
-            --border-light: #4b5563;
-            
-            --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.3);
-            --shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.4), 0 1px 2px 0 rgba(0, 0, 0, 0.2);
-            --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.4), 0 2px 4px -1px rgba(0, 0, 0, 0.2);
-            --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.4), 0 4px 6px -2px rgba(0, 0, 0, 0.2);
-        }
-    }
-    
-    /* Base styles */
-    .stApp {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif !important;
-        background: var(--bg-primary) !important;
-        color: var(--text-primary) !important;
-    }
-    
-    /* Hide Streamlit elements */
-    #MainMenu, footer, header { visibility: hidden; }
-    .stDeployButton { display: none !important; }
-    .stToolbar { display: none !important; }
-    
-    /* Login Page */
-    .login-container {
-        max-width: 400px;
-        margin: 4rem auto;
-        padding: 3rem;
-        background: var(--bg-primary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-xl);
-        box-shadow: var(--shadow-lg);
-    }
-    
-    .login-header {
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .login-title {
-        font-size: 2rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin: 0 0 0.5rem 0;
-    }
-    
-    .login-subtitle {
-        color: var(--text-muted);
-        font-size: 1rem;
-        margin: 0;
-    }
-    
-    /* Form Inputs */
-    .stTextInput > div > div > input,
-    .stTextArea textarea {
-        background: var(--bg-secondary) !important;
-        border: 1px solid var(--border) !important;
-        border-radius: var(--radius-lg) !important;
-        color: var(--text-primary) !important;
-        padding: 0.75rem 1rem !important;
-        font-size: 0.875rem !important;
-        transition: all 0.2s ease !important;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stTextArea textarea:focus {
-        border-color: var(--primary) !important;
-        box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.1) !important;
-        outline: none !important;
-    }
-    
-    .stTextInput > div > div > input::placeholder,
-    .stTextArea textarea::placeholder {
-        color: var(--text-muted) !important;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: var(--primary) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: var(--radius-lg) !important;
-        padding: 0.75rem 1.5rem !important;
-        font-size: 0.875rem !important;
-        font-weight: 500 !important;
-        cursor: pointer !important;
-        transition: all 0.2s ease !important;
-        height: auto !important;
-    }
-    
-    .stButton > button:hover {
-        background: var(--primary-hover) !important;
-        transform: translateY(-1px) !important;
-        box-shadow: var(--shadow-md) !important;
-    }
-    
-    /* Secondary button */
-    .secondary-btn > button {
-        background: var(--bg-secondary) !important;
-        color: var(--text-secondary) !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    .secondary-btn > button:hover {
-        background: var(--bg-tertiary) !important;
-        color: var(--text-primary) !important;
-    }
-    
-    /* App Header */
-    .app-header {
-        background: var(--bg-primary);
-        border-bottom: 1px solid var(--border);
-        padding: 1.5rem 0;
-        margin-bottom: 2rem;
-    }
-    
-    .header-content {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        max-width: 1200px;
-        margin: 0 auto;
-        padding: 0 1rem;
-    }
-    
-    .brand-section h1 {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin: 0;
-    }
-    
-    .brand-section p {
-        color: var(--text-muted);
-        font-size: 0.875rem;
-        margin: 0.25rem 0 0 0;
-    }
-    
-    .user-section {
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-        padding: 0.5rem 1rem;
-        background: var(--bg-secondary);
-        border-radius: var(--radius-lg);
-        border: 1px solid var(--border);
-    }
-    
-    .user-avatar {
-        width: 32px;
-        height: 32px;
-        background: var(--primary);
-        color: white;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: 600;
-        font-size: 0.875rem;
-    }
-    
-    .user-info h4 {
-        font-size: 0.875rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin: 0;
-    }
-    
-    .user-info p {
-        font-size: 0.75rem;
-        color: var(--text-muted);
-        margin: 0;
-        font-family: 'JetBrains Mono', monospace;
-    }
-    
-    /* Cards */
-    .card {
-        background: var(--bg-primary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-xl);
-        padding: 2rem;
-        margin-bottom: 2rem;
-        box-shadow: var(--shadow-sm);
-    }
-    
-    .card-header {
-        margin-bottom: 1.5rem;
-        padding-bottom: 1rem;
-        border-bottom: 1px solid var(--border-light);
-    }
-    
-    .card-header h2 {
-        font-size: 1.25rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin: 0 0 0.5rem 0;
-    }
-    
-    .card-header p {
-        color: var(--text-muted);
-        font-size: 0.875rem;
-        margin: 0;
-    }
-    
-    /* Status indicator */
-    .status-badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        background: var(--success-light);
-        color: var(--success);
-        padding: 0.5rem 1rem;
-        border-radius: var(--radius-lg);
-        font-size: 0.875rem;
-        font-weight: 500;
-        border: 1px solid var(--success);
-    }
-    
-    .status-dot {
-        width: 6px;
-        height: 6px;
-        background: var(--success);
-        border-radius: 50%;
-    }
-    
-    /* Metrics */
-    .metrics-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-        gap: 1rem;
-        margin: 1.5rem 0;
-    }
-    
-    .metric-card {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 1.5rem 1rem;
-        text-align: center;
-    }
-    
-    .metric-value {
-        font-size: 1.75rem;
-        font-weight: 700;
-        color: var(--primary);
-        margin: 0 0 0.25rem 0;
-        font-family: 'JetBrains Mono', monospace;
-    }
-    
-    .metric-label {
-        font-size: 0.75rem;
-        color: var(--text-muted);
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 0.025em;
-    }
-    
-    /* Response section */
-    .response-container {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 1.5rem;
-        margin-top: 1rem;
-    }
-    
-    .response-header {
-        font-size: 1rem;
-        font-weight: 600;
-        color: var(--primary);
-        margin: 0 0 1rem 0;
-    }
-    
-    .query-preview {
-        background: var(--bg-tertiary);
-        border: 1px solid var(--border-light);
-        border-radius: var(--radius);
-        padding: 0.75rem;
-        margin-bottom: 1rem;
-        font-size: 0.875rem;
-        color: var(--text-secondary);
-        font-style: italic;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        background: var(--bg-secondary);
-        border-radius: var(--radius-lg);
-        padding: 0.25rem;
-        border: 1px solid var(--border);
-        margin-bottom: 1rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        border-radius: var(--radius);
-        color: var(--text-muted);
-        font-weight: 500;
-        font-size: 0.875rem;
-        padding: 0.5rem 1rem;
-        border: none;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: var(--primary);
-        color: white;
-        font-weight: 600;
-    }
-    
-    /* File uploader */
-    .stFileUploader {
-        background: var(--bg-secondary);
-        border: 2px dashed var(--border);
-        border-radius: var(--radius-lg);
-        padding: 2rem 1rem;
-        text-align: center;
-    }
-    
-    .stFileUploader:hover {
-        border-color: var(--primary);
-        background: var(--primary-light);
-    }
-    
-    /* Alert messages */
-    .stSuccess, .stError, .stWarning, .stInfo {
-        border-radius: var(--radius-lg);
-        border: none;
-        padding: 0.75rem 1rem;
-        font-size: 0.875rem;
-    }
-    
-    .stSuccess {
-        background: var(--success-light);
-        color: var(--success);
-    }
-    
-    .stError {
-        background: var(--error-light);
-        color: var(--error);
-    }
-    
-    .stWarning {
-        background: var(--warning-light);
-        color: var(--warning);
-    }
-    
-    /* Empty state */
-    .empty-state {
-        text-align: center;
-        padding: 3rem 1rem;
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-xl);
-        color: var(--text-muted);
-    }
-    
-    .empty-state h3 {
-        font-size: 1.125rem;
-        font-weight: 600;
-        color: var(--text-secondary);
-        margin: 0 0 0.5rem 0;
-    }
-    
-    .empty-state p {
-        font-size: 0.875rem;
-        margin: 0 0 1.5rem 0;
-    }
-    
-    /* Section divider */
-    .section-divider {
-        margin: 3rem 0 2rem 0;
-        border: none;
-        border-top: 2px solid var(--border);
-        position: relative;
-    }
-    
-    .section-divider::after {
-        content: '';
-        position: absolute;
-        top: -1px;
-        left: 50%;
-        transform: translateX(-50%);
-        width: 100px;
-        height: 2px;
-        background: var(--primary);
-    }
-    
-    /* Responsive */
-    @media (max-width: 768px) {
-        .login-container {
-            margin: 2rem 1rem;
-            padding: 2rem;
-        }
-        
-        .header-content {
-            flex-direction: column;
-            gap: 1rem;
-            text-align: center;
-        }
-        
-        .user-section {
-            flex-direction: column;
-        }
-        
-        .card {
-            padding: 1.5rem;
-        }
-        
-        .metrics-grid {
-            grid-template-columns: 1fr;
-        }
-    }
-    
-    /* Override Streamlit defaults */
-    div[data-testid="stMarkdownContainer"] p {
-        color: var(--text-primary);
-    }
-    
-    div[data-testid="stMarkdownContainer"] h1,
-    div[data-testid="stMarkdownContainer"] h2,
-    div[data-testid="stMarkdownContainer"] h3,
-    div[data-testid="stMarkdownContainer"] h4 {
-        color: var(--text-primary);
-    }
-    
-    .stTextInput > label,
-    .stTextArea > label,
-    .stFileUploader > label {
-        color: var(--text-secondary);
-        font-weight: 500;
-        font-size: 0.875rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+@st.cache_resource
+def init_metrics_server():
+    """Start the Prometheus /metrics endpoint once per process when a port is configured"""
+    if METRICS_PORT:
+        return metrics.start_metrics_server(int(METRICS_PORT))
+    return None
+
+@st.cache_resource
+def init_query_history() -> QueryHistoryStore:
+    """Open the local query history database once per process"""
+    return QueryHistoryStore()
+
+@st.cache_resource
+def init_upload_index() -> UploadIndex:
+    """Open the local uploaded-content index once per process"""
+    return UploadIndex()
 
-def authenticate_user(org_name: str, password: str) -> tuple[bool, Optional[str]]:
-    """Authenticate user with org_name and password against Supabase"""
+def _execute_query(name: str, query):
+    """Run a Supabase query and record it in the metrics registry"""
+    with metrics.registry.timed(name):
+        return query.execute()
+
+@st.cache_resource
+def login_capabilities() -> dict:
+    """Process-wide login settings learned at runtime (this script's globals reset on every rerun)"""
+    # tenant_embed: whether orgs can embed org_directory in one select (needs a foreign key)
+    return {"tenant_embed": True}
+
+def _fetch_tenant_id(supabase: Client, org_id: str) -> Optional[str]:
+    """Look up the tenant_id of an org in org_directory"""
+    response = _execute_query("supabase_org_directory", supabase.table("org_directory").select("tenant_id").eq("org_id", org_id).limit(1))
+    return response.data[0]["tenant_id"] if response.data else None
+
+def _embedded_tenant_id(org_data: dict) -> Optional[str]:
+    """Get the tenant_id from an org row with org_directory embedded"""
+    directory = org_data.get("org_directory")
+    if isinstance(directory, list):
+        directory = directory[0] if directory else None
+    return directory.get("tenant_id") if directory else None
+
+def authenticate_user(org_name: str, password: str) -> tuple[bool, Optional[str], Optional[str]]:
+    """Authenticate user with org_name and password against Supabase, returning the org and tenant ids"""
     try:
         if not org_name or not password:
-            return False, None
+            return False, None, None
             
         supabase = init_supabase()
-        response = supabase.table("orgs").select("id, org_name, password").eq("org_name", org_name).execute()
+        response = None
+        capabilities = login_capabilities()
+        if capabilities["tenant_embed"]:
+            # Fetch the org and its tenant in one round-trip
+            try:
+                response = _execute_query("supabase_orgs", supabase.table("orgs").select("id, org_name, password, org_directory(tenant_id)").eq("org_name", org_name))
+            except APIError as e:
+                if e.code != "PGRST200":
+                    raise
+                # No relationship between orgs and org_directory: use two queries from now on
+                capabilities["tenant_embed"] = False
+        if response is None:
+            response = _execute_query("supabase_orgs", supabase.table("orgs").select("id, org_name, password").eq("org_name", org_name))
         
         if not response.data:
             st.error("Organization not found")
-            return False, None
+            return False, None, None
         
         org_data = response.data[0]
         
         if org_data["password"] == password:
-            return True, org_data["id"]
+            if "org_directory" in org_data:
+                tenant_id = _embedded_tenant_id(org_data)
+            else:
+                tenant_id = _fetch_tenant_id(supabase, org_data["id"])
+            return True, org_data["id"], tenant_id
         else:
             st.error("Invalid password")
-            return False, None
+            return False, None, None
             
     except Exception as e:
         st.error(f"Authentication error: {str(e)}")
-        return False, None
+        return False, None, None
 
 def login_page():
     """Display the clean login page"""
@@ -550,7 +128,7 @@ def login_page():
         initial_sidebar_state="collapsed"
     )
     
-    load_modern_css()
+    inject_styles()
     
     st.markdown("""
     <div class="login-container">
@@ -583,9 +161,7 @@ def login_page():
                 st.error("Please enter both organization name and password")
             else:
                 with st.spinner("Authenticating..."):
-                    supabase = init_supabase()
-                    is_authenticated, org_id = authenticate_user(org_name, password)
-                    tenant_id = supabase.table("org_directory").select("tenant_id").eq("org_id", org_id).execute()
+                    is_authenticated, org_id, tenant_id = authenticate_user(org_name, password)
                     if is_authenticated:
                         st.session_state.authenticated = True
                         st.session_state.org_name = org_name
@@ -596,10 +172,6 @@ def login_page():
                         time.sleep(1)
                         st.rerun()
 
-def generate_idempotency_key():
-    """Generate a unique idempotency key"""
-    return str(uuid.uuid4())
-
 def get_or_create_idempotency_key():
     """Get existing idempotency key or create a new one"""
     if "idempotency_key" not in st.session_state or st.session_state.idempotency_key is None:
@@ -608,91 +180,197 @@ def get_or_create_idempotency_key():
 
 def init_intake() -> Optional[str]:
     """Initialize a new intake and return the intake_id"""
+    intake_id, error = intake_api.init_intake(st.session_state.org_id, st.session_state.password,
+                                              get_or_create_idempotency_key())
+    if error:
+        st.error(error)
+    return intake_id
+
+def check_duplicate_upload(content_hash: str, intake_id: str, label: str) -> bool:
+    """Warn about content the org uploaded before and return True if this upload should be skipped"""
+    kind, earlier = find_duplicate(init_upload_index().lookup(st.session_state.org_id, content_hash), intake_id)
+    if kind is None:
+        return False
+    
+    when = format_relative(datetime.fromtimestamp(earlier["uploaded_at"], timezone.utc), datetime.now(timezone.utc)).lower()
+    allowed = st.session_state.get("allow_duplicate_uploads", False)
+    if kind == "pending" or allowed:
+        st.warning(f"{label} was already uploaded {when} (intake {earlier['intake_id']}); uploading it again.")
+        return False
+    if kind == "same_intake":
+        st.warning(f"{label} is already in this intake (uploaded {when}); skipped.")
+    else:
+        st.warning(f"{label} is already in your knowledge base (uploaded {when}); skipped. "
+                   "Tick \"Upload duplicates anyway\" to send it again.")
+    return True
+
+def record_upload(content_hash: str, intake_id: str, name: Optional[str] = None, size: Optional[int] = None):
+    """Add successfully uploaded content to the org's dedup index"""
     try:
-        headers = {
-            "x-org-id": str(st.session_state.org_id),
-            "x-idempotency-key": get_or_create_idempotency_key(),
-            "Authorization": f"Bearer {st.session_state.password}"
-        }
-        
-        response = requests.post(f"{API_BASE_URL}/api/intakes/init", headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("intake_id")
-        else:
-            st.error(f"Failed to initialize intake: {response.status_code}")
-            return None
+        init_upload_index().record(st.session_state.org_id, content_hash, intake_id, name, size)
     except Exception as e:
-        st.error(f"Error initializing intake: {str(e)}")
-        return None
+        st.warning(f"Could not update the upload index: {str(e)}")
 
 def upload_file(intake_id: str, uploaded_file) -> bool:
     """Upload a file to the intake"""
     try:
-        headers = {
-            "x-org-id": str(st.session_state.org_id),
-            "x-idempotency-key": get_or_create_idempotency_key(),
-            "Authorization": f"Bearer {st.session_state.password}"
-        }
-        
-        files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
-        
-        response = requests.post(f"{API_BASE_URL}/api/upload/file/{intake_id}", headers=headers, files=files)
-        
-        if response.status_code == 200:
-            st.success("File uploaded successfully!")
-            st.session_state.idempotency_key = generate_idempotency_key()
-            return True
-        else:
-            st.error(f"Failed to upload file: {response.status_code}")
-            return False
+        content_hash = hash_file(uploaded_file)
     except Exception as e:
         st.error(f"Error uploading file: {str(e)}")
         return False
+    if check_duplicate_upload(content_hash, intake_id, f"**{uploaded_file.name}**"):
+        return False
+    
+    idempotency_key = get_or_create_idempotency_key()
+    chunked_upload = None
+    if CHUNKED_UPLOADS_ENABLED and uploaded_file.size > CHUNKED_UPLOAD_THRESHOLD:
+        # Part-upload progress survives reruns so a failed upload resumes where it stopped
+        if "chunked_uploads" not in st.session_state:
+            st.session_state.chunked_uploads = {}
+        chunked_upload = st.session_state.chunked_uploads.get(idempotency_key)
+        if chunked_upload is None or not chunked_upload.matches(uploaded_file.name, uploaded_file.size):
+            chunked_upload = intake_api.new_chunked_upload(uploaded_file, idempotency_key)
+            st.session_state.chunked_uploads = {idempotency_key: chunked_upload}
+    
+    success, error = intake_api.upload_file(intake_id, uploaded_file, st.session_state.org_id,
+                                            st.session_state.password, idempotency_key, chunked_upload)
+    if not success:
+        for message in error.split("\n", 1):
+            st.error(message)
+        return False
+    
+    st.success("File uploaded successfully!")
+    st.session_state.get("chunked_uploads", {}).pop(idempotency_key, None)
+    st.session_state.idempotency_key = generate_idempotency_key()
+    record_upload(content_hash, intake_id, uploaded_file.name, uploaded_file.size)
+    return True
+
+def upload_files_batch(intake_id: str, uploaded_files: list) -> int:
+    """Upload several files concurrently into the intake and return how many succeeded"""
+    # One idempotency key per file, kept until that file succeeds so retries stay idempotent
+    if "batch_idempotency_keys" not in st.session_state:
+        st.session_state.batch_idempotency_keys = {}
+    keys = st.session_state.batch_idempotency_keys
+    
+    # Skip content already uploaded, including files repeated within this batch
+    content_hashes = [hash_file(f) for f in uploaded_files]
+    skipped = set()
+    for index, uploaded_file in enumerate(uploaded_files):
+        if content_hashes[index] in content_hashes[:index]:
+            st.warning(f"**{uploaded_file.name}** has the same content as another file in this batch; skipped.")
+            skipped.add(index)
+        elif check_duplicate_upload(content_hashes[index], intake_id, f"**{uploaded_file.name}**"):
+            skipped.add(index)
+    pending = [index for index in range(len(uploaded_files)) if index not in skipped]
+    
+    file_keys = [getattr(f, "file_id", None) or f"{f.name}:{f.size}" for f in uploaded_files]
+    for file_key in [file_keys[index] for index in pending]:
+        if file_key not in keys:
+            keys[file_key] = generate_idempotency_key()
+    
+    total = len(pending)
+    if not total:
+        st.info("Nothing to upload: every file was uploaded before.")
+        return 0
+    progress = st.progress(0.0, text=f"Uploading 0 of {total} files...")
+    rows = {}
+    for index, uploaded_file in enumerate(uploaded_files):
+        rows[index] = st.empty()
+        if index in skipped:
+            rows[index].markdown(f"⏭️ **{uploaded_file.name}** — Skipped (already uploaded)")
+        else:
+            rows[index].markdown(f"⏳ **{uploaded_file.name}** — Queued")
+    
+    pending_files = [uploaded_files[index] for index in pending]
+    pending_keys = [keys[file_keys[index]] for index in pending]
+    done = succeeded = 0
+    for position, success, message in intake_api.upload_files_concurrently(
+            intake_id, pending_files, st.session_state.org_id, st.session_state.password, pending_keys):
+        index = pending[position]
+        done += 1
+        icon = "✅" if success else "❌"
+        rows[index].markdown(f"{icon} **{uploaded_files[index].name}** — {message}")
+        if success:
+            succeeded += 1
+            keys.pop(file_keys[index], None)
+            record_upload(content_hashes[index], intake_id, uploaded_files[index].name, uploaded_files[index].size)
+        progress.progress(done / total, text=f"Uploaded {done} of {total} files...")
+    
+    if succeeded == total:
+        st.success(f"All {total} files uploaded successfully!")
+    else:
+        st.error(f"{total - succeeded} of {total} files failed to upload. Upload again to retry them.")
+    return succeeded
 
 def upload_text(intake_id: str, text_content: str) -> bool:
     """Upload text content to the intake"""
-    try:
-        headers = {
-            "x-org-id": str(st.session_state.org_id),
-            "x-idempotency-key": get_or_create_idempotency_key(),
-            "Authorization": f"Bearer {st.session_state.password}"
-        }
-        
-        data = {"text_content": text_content}
-        
-        response = requests.post(f"{API_BASE_URL}/api/upload/text/{intake_id}", headers=headers, data=data)
-        
-        if response.status_code == 200:
-            st.success("Text uploaded successfully!")
-            st.session_state.idempotency_key = generate_idempotency_key()
-            return True
-        else:
-            st.error(f"Failed to upload text: {response.status_code}")
-            return False
-    except Exception as e:
-        st.error(f"Error uploading text: {str(e)}")
+    content_hash = hash_text(text_content)
+    if check_duplicate_upload(content_hash, intake_id, "This text"):
         return False
+    
+    success, error = intake_api.upload_text(intake_id, text_content, st.session_state.org_id,
+                                            st.session_state.password, get_or_create_idempotency_key())
+    if not success:
+        st.error(error)
+        return False
+    
+    st.success("Text uploaded successfully!")
+    st.session_state.idempotency_key = generate_idempotency_key()
+    record_upload(content_hash, intake_id, "Text input", len(text_content))
+    return True
 
 def get_intake_status(intake_id: str) -> Optional[dict]:
     """Get the status of an intake"""
+    status, error = fetch_intake_status(intake_id, st.session_state.org_id, st.session_state.password)
+    if error:
+        st.error(error)
+    return status
+
+def start_status_watcher(intake_id: str):
+    """Start polling the intake status in the background, replacing any running watcher"""
+    stop_status_watcher()
+    org_id = st.session_state.org_id
+    password = st.session_state.password
+    watcher = IntakeStatusWatcher(intake_id, lambda: fetch_intake_status(intake_id, org_id, password))
+    st.session_state.status_watcher = watcher.start()
+
+def stop_status_watcher():
+    """Stop the background status watcher if one is running"""
+    watcher = st.session_state.get("status_watcher")
+    if watcher is not None:
+        watcher.stop()
+    st.session_state.status_watcher = None
+
+def intake_status_region(live: bool):
+    """Render the latest polled intake status; reruns on its own as a fragment while live"""
+    watcher = st.session_state.get("status_watcher")
+    if watcher is None:
+        return
+    if live and not watcher.is_running:
+        # Polling finished: one full rerun re-creates this region without its timer
+        st.rerun()
+    
+    snapshot = watcher.snapshot()
+    if snapshot["error"]:
+        st.warning(snapshot["error"])
+    if snapshot["status"] is not None:
+        st.json(snapshot["status"])
+    
+    if watcher.is_running:
+        caption = f"Watching intake status • {snapshot['polls']} checks so far"
+        if snapshot["next_poll_in"] is not None:
+            caption += f" • next check in {snapshot['next_poll_in']:.0f}s"
+        st.caption(caption)
+    else:
+        st.caption(f"Status watch ended after {snapshot['polls']} checks")
+
+def remember_answer(query: str, result, elapsed: float):
+    """Keep a fresh answer in the shared answer cache and the org's query history"""
+    cache_answer(st.session_state.org_id, query, result)
     try:
-        headers = {
-            "x-org-id": str(st.session_state.org_id),
-            "Authorization": f"Bearer {st.session_state.password}"
-        }
-        
-        response = requests.get(f"{API_BASE_URL}/api/intakes/{intake_id}", headers=headers)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Failed to get intake status: {response.status_code}")
-            return None
+        init_query_history().record(st.session_state.org_id, query, result, elapsed)
     except Exception as e:
-        st.error(f"Error getting intake status: {str(e)}")
-        return None
+        st.warning(f"Could not save query to history: {str(e)}")
 
 def query_insights(query: str) -> Optional[dict]:
     """Query insights from the API using the /api/query endpoint"""
@@ -704,10 +382,13 @@ def query_insights(query: str) -> Optional[dict]:
         
         data = {"question": query}  
         
-        response = requests.post(f"{API_BASE_URL}/api/query", headers=headers, json=data)
+        start = time.perf_counter()
+        response = api_client.post("query_insights", f"{API_BASE_URL}/api/query", headers=headers, json=data)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            remember_answer(query, result, time.perf_counter() - start)
+            return result
         else:
             st.error(f"Failed to query insights: {response.status_code}")
             if response.text:
@@ -717,6 +398,68 @@ def query_insights(query: str) -> Optional[dict]:
         st.error(f"Error querying insights: {str(e)}")
         return None
 
+# Keys a streamed query event may carry its text chunk under
+STREAM_TEXT_KEYS = ("delta", "token", "text", "content", "answer")
+
+def _stream_text_chunks(response):
+    """Yield answer text from a streamed /api/query response (SSE or plain chunked text)"""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        for data in api_client.iter_sse_data(response):
+            if data == "[DONE]":
+                break
+            try:
+                event = json.loads(data)
+            except ValueError:
+                yield data
+                continue
+            if isinstance(event, dict):
+                for key in STREAM_TEXT_KEYS:
+                    if isinstance(event.get(key), str):
+                        yield event[key]
+                        break
+            elif isinstance(event, str):
+                yield event
+    else:
+        response.encoding = response.encoding or "utf-8"
+        for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+            if chunk:
+                yield chunk
+
+def stream_query_insights(query: str) -> Optional[dict]:
+    """Query insights and render the answer as it arrives; falls back to a JSON response"""
+    try:
+        headers = {
+            "x-org-id": str(st.session_state.org_id),
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream, text/plain;q=0.9, application/json;q=0.8"
+        }
+        
+        data = {"question": query}
+        
+        start = time.perf_counter()
+        with st.spinner("Analyzing..."):
+            response = api_client.post("query_insights", f"{API_BASE_URL}/api/query", headers=headers, json=data, stream=True)
+        
+        with response:
+            if response.status_code != 200:
+                st.error(f"Failed to query insights: {response.status_code}")
+                if response.text:
+                    st.error(f"Response: {response.text}")
+                return None
+            
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream") or content_type.startswith("text/plain"):
+                result = {"answer": st.write_stream(_stream_text_chunks(response))}
+            else:
+                # The server doesn't stream: same as query_insights
+                result = response.json()
+        
+        remember_answer(query, result, time.perf_counter() - start)
+        return result
+    except Exception as e:
+        st.error(f"Error querying insights: {str(e)}")
+        return None
+
 def add_scooby_to_meeting(meeting_link: str) -> bool:
     """Add Scooby to the meeting using the provided endpoint"""
     try:
@@ -733,7 +476,7 @@ def add_scooby_to_meeting(meeting_link: str) -> bool:
             "saveTranscript": True
         }
         
-        response = requests.post(f"{API_BOT_URL}/add_scooby", headers=headers, json=data)
+        response = api_client.post("add_scooby_to_meeting", f"{API_BOT_URL}/add_scooby", headers=headers, json=data)
         
         if response.status_code == 200:
             st.success("Scooby has been successfully added to your meeting!")
@@ -748,449 +491,753 @@ def add_scooby_to_meeting(meeting_link: str) -> bool:
 
 def finalize_intake(intake_id: str) -> bool:
     """Finalize the intake"""
+    success, error = intake_api.finalize_intake(intake_id, st.session_state.org_id, st.session_state.password)
+    if not success:
+        st.error(error)
+        return False
+    
+    st.success("Intake finalized successfully!")
+    invalidate_memories_cache(st.session_state.org_id)
+    invalidate_answer_cache(st.session_state.org_id)
     try:
-        headers = {
-            "x-org-id": str(st.session_state.org_id),
-            "Authorization": f"Bearer {st.session_state.password}"
-        }
-        
-        response = requests.post(f"{API_BASE_URL}/api/intakes/{intake_id}/finalize", headers=headers)
-        
-        if response.status_code == 200:
-            st.success("Intake finalized successfully!")
-            return True
-        else:
-            st.error(f"Failed to finalize intake: {response.status_code}")
-            return False
+        init_upload_index().mark_finalized(st.session_state.org_id, intake_id)
     except Exception as e:
-        st.error(f"Error finalizing intake: {str(e)}")
-        return False
+        st.warning(f"Could not update the upload index: {str(e)}")
+    return True
 
 def reset_session():
     """Reset the session and clear all state"""
     st.session_state.intake_id = None
     st.session_state.intake_initialized = False
     st.session_state.idempotency_key = None
+    st.session_state.chunked_uploads = {}
+    st.session_state.batch_idempotency_keys = {}
+    stop_status_watcher()
     if hasattr(st.session_state, 'last_query_response'):
         delattr(st.session_state, 'last_query_response')
+    st.session_state.pop("batch_query_results", None)
     st.success("Session reset successfully!")
     st.rerun()
 
 def logout():
     """Logout and clear authentication"""
+    stop_status_watcher()
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     st.success("Logged out successfully!")
     time.sleep(1)
     st.rerun()
 
-def main_app():
-    """Main application with clean, professional design"""
-    st.set_page_config(
-        page_title="Pulse Copilot - Dashboard",
-        page_icon="⚡",
-        layout="wide",
-        initial_sidebar_state="collapsed"
-    )
-    
-    load_modern_css()
-    
-    # Clean Header
-    org_initial = st.session_state.org_name[0].upper() if st.session_state.org_name else "O"
-    
-    st.markdown(f"""
-    <div class="app-header">
-        <div class="header-content">
-            <div class="brand-section">
-                <h1>Pulse Copilot</h1>
-            </div>
-            <div class="user-section">
-                <div class="user-avatar">{org_initial}</div>
-                <div class="user-info">
-                    <h4>{st.session_state.org_name}</h4>
-                    <p>ID: {st.session_state.org_id}</p>
-                </div>
-            </div>
+def intake_tab():
+    """Data Intake & Management section"""
+    # Step 1: Initialize Intake
+    st.markdown("""
+    <div class="card">
+        <div class="card-header">
+            <h2>Initialize Intake Session</h2>
+            <p>Start a new session to upload your meetings transcript to Pulse</p>
         </div>
     </div>
     """, unsafe_allow_html=True)
     
-    # Logout button
-    col1, col2, col3 = st.columns([6, 1, 2])
-    with col3:
-        if st.button("Sign Out", key="logout_btn", use_container_width=True):
-            logout()
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Initialize session state
-    if "intake_id" not in st.session_state:
-        st.session_state.intake_id = None
-    if "intake_initialized" not in st.session_state:
-        st.session_state.intake_initialized = False
-    if "idempotency_key" not in st.session_state:
-        st.session_state.idempotency_key = None
-    
-    # Clean tabs - now with merged Data Intake & Management tab
-    tab1, tab2, tab3, tab4 = st.tabs(["Data Intake & Management", "Intakes History", "Query Insights", "Meeting Assistant"])
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.button("Initialize New Intake", key="init_btn", use_container_width=True):
+            with st.spinner("Initializing intake session..."):
+                intake_id = init_intake()
+                if intake_id:
+                    stop_status_watcher()
+                    st.session_state.intake_id = intake_id
+                    st.session_state.intake_initialized = True
+                    st.success("Intake session initialized successfully!")
+    
+    if st.session_state.intake_initialized:
+        st.markdown(f"""
+        <div style="text-align: center; margin-top: 1rem;">
+            <div class="status-badge">
+                <div class="status-dot"></div>
+                Active Session: {st.session_state.intake_id[:8]}...
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    with tab1:
-        # Step 1: Initialize Intake
+    # Step 2: Upload Content
+    if st.session_state.intake_initialized:
         st.markdown("""
         <div class="card">
             <div class="card-header">
-                <h2>Initialize Intake Session</h2>
-                <p>Start a new session to upload your meetings transcript to Pulse</p>
+                <h2>Upload Your Content</h2>
+                <p>Add documents, files, or text content to Pulse</p>
             </div>
         </div>
         """, unsafe_allow_html=True)
         
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            if st.button("Initialize New Intake", key="init_btn", use_container_width=True):
-                with st.spinner("Initializing intake session..."):
-                    intake_id = init_intake()
-                    if intake_id:
-                        st.session_state.intake_id = intake_id
-                        st.session_state.intake_initialized = True
-                        st.success("Intake session initialized successfully!")
-        
-        if st.session_state.intake_initialized:
-            st.markdown(f"""
-            <div style="text-align: center; margin-top: 1rem;">
-                <div class="status-badge">
-                    <div class="status-dot"></div>
-                    Active Session: {st.session_state.intake_id[:8]}...
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.checkbox(
+            "Upload duplicates anyway",
+            key="allow_duplicate_uploads",
+            help="Content your organization already uploaded into this intake or a finalized one is skipped unless this is ticked"
+        )
+        upload_tab1, upload_tab2, upload_tab3 = st.tabs(["File Upload", "Text Input", "Batch Upload"])
         
-        # Step 2: Upload Content
-        if st.session_state.intake_initialized:
-            st.markdown("""
-            <div class="card">
-                <div class="card-header">
-                    <h2>Upload Your Content</h2>
-                    <p>Add documents, files, or text content to Pulse</p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        with upload_tab1:
+            st.markdown("#### Upload Documents")
+            st.write("Upload files containing your meeting notes, reports, research, or any text content.")
             
-            upload_tab1, upload_tab2 = st.tabs(["File Upload", "Text Input"])
+            uploaded_file = st.file_uploader(
+                "Choose a file",
+                type=["txt", "md", "pdf", "docx"],
+                help="Supported formats: .txt, .md, .pdf, .docx (Max 10MB)",
+                label_visibility="collapsed"
+            )
             
-            with upload_tab1:
-                st.markdown("#### Upload Documents")
-                st.write("Upload files containing your meeting notes, reports, research, or any text content.")
+            if uploaded_file is not None:
+                st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
                 
-                uploaded_file = st.file_uploader(
-                    "Choose a file",
-                    type=["txt", "md", "pdf", "docx"],
-                    help="Supported formats: .txt, .md, .pdf, .docx (Max 10MB)",
-                    label_visibility="collapsed"
-                )
+                col1, col2, col3 = st.columns(3)
                 
-                if uploaded_file is not None:
-                    st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-label">File Name</div>
-                            <div style="font-weight: 600; color: var(--text-primary); font-size: 0.9rem; margin-top: 0.5rem; word-break: break-all;">
-                                {uploaded_file.name}
-                            </div>
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-label">File Name</div>
+                        <div style="font-weight: 600; color: var(--text-primary); font-size: 0.9rem; margin-top: 0.5rem; word-break: break-all;">
+                            {uploaded_file.name}
                         </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        file_size_mb = uploaded_file.size / (1024 * 1024)
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{file_size_mb:.1f}</div>
-                            <div class="metric-label">MB</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{uploaded_file.type.split('/')[-1].upper()}</div>
-                            <div class="metric-label">Format</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        if st.button("Upload File", key="upload_file_btn", use_container_width=True):
-                            with st.spinner("Uploading and processing your file..."):
-                                if upload_file(st.session_state.intake_id, uploaded_file):
-                                    st.rerun()
-            
-            with upload_tab2:
-                st.markdown("#### Direct Text Input")
-                st.write("Enter your content directly for immediate analysis and processing.")
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                text_content = st.text_area(
-                    "Content",
-                    placeholder="Paste your meeting notes, research findings, reports, or any text content here...\n\nExample:\n- Meeting summary from Q4 planning session\n- Customer feedback analysis\n- Project status reports\n- Research findings",
-                    height=300,
-                    help="Enter any text content you'd like to analyze",
-                    label_visibility="collapsed"
-                )
+                with col2:
+                    file_size_mb = uploaded_file.size / (1024 * 1024)
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{file_size_mb:.1f}</div>
+                        <div class="metric-label">MB</div>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                if text_content.strip():
-                    st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{len(text_content):,}</div>
-                            <div class="metric-label">Characters</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        word_count = len(text_content.split())
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{word_count:,}</div>
-                            <div class="metric-label">Words</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        estimated_read_time = max(1, word_count // 200)
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{estimated_read_time}</div>
-                            <div class="metric-label">Min Read</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        if st.button("Upload Text", key="upload_text_btn", use_container_width=True):
-                            with st.spinner("Processing and analyzing your text..."):
-                                if upload_text(st.session_state.intake_id, text_content):
-                                    st.rerun()
-            
-            # Management Section - Divider
-            st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
-            
-            # Management Section
-            st.markdown("""
-            <div class="card">
-                <div class="card-header">
-                    <h2>Session Management</h2>
-                    <p>Manage your current intake session and finalize your data to add it to the Pulse knowledge base</p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{uploaded_file.type.split('/')[-1].upper()}</div>
+                        <div class="metric-label">Format</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    if st.button("Upload File", key="upload_file_btn", use_container_width=True):
+                        with st.spinner("Uploading and processing your file..."):
+                            if upload_file(st.session_state.intake_id, uploaded_file):
+                                st.rerun()
+        
+        with upload_tab2:
+            st.markdown("#### Direct Text Input")
+            st.write("Enter your content directly for immediate analysis and processing.")
             
-            # Current session info
-            st.markdown(f"""
-            <div style="background: var(--bg-secondary); 
-                        border: 1px solid var(--border); 
-                        border-radius: var(--radius-lg); 
-                        padding: 1.5rem; 
-                        margin-bottom: 1.5rem;">
-                <h4 style="margin: 0 0 0.5rem 0; color: var(--primary); font-weight: 600;">Current Session</h4>
-                <p style="margin: 0; font-family: 'JetBrains Mono', monospace; font-size: 0.875rem; color: var(--text-secondary); background: var(--bg-tertiary); padding: 0.75rem; border-radius: var(--radius); border: 1px solid var(--border-light);">
-                    <strong>Intake ID:</strong> {st.session_state.intake_id}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            text_content = st.text_area(
+                "Content",
+                placeholder="Paste your meeting notes, research findings, reports, or any text content here...\n\nExample:\n- Meeting summary from Q4 planning session\n- Customer feedback analysis\n- Project status reports\n- Research findings",
+                height=300,
+                help="Enter any text content you'd like to analyze",
+                label_visibility="collapsed",
+                key="text_content_input"
+            )
             
-            # Action buttons
-            col1, col2, col3 = st.columns(3)
+            # Computed once per distinct paste, not on every rerun
+            stats = text_stats(text_content)
+            if stats["has_content"]:
+                st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{stats["characters"]:,}</div>
+                        <div class="metric-label">Characters</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{stats["words"]:,}</div>
+                        <div class="metric-label">Words</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{stats["read_minutes"]}</div>
+                        <div class="metric-label">Min Read</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    if st.button("Upload Text", key="upload_text_btn", use_container_width=True):
+                        with st.spinner("Processing and analyzing your text..."):
+                            if upload_text(st.session_state.intake_id, text_content):
+                                st.rerun()
+        
+        with upload_tab3:
+            st.markdown("#### Batch Upload")
+            st.write("Upload several files into the current intake at once. Files are transferred in parallel.")
             
-            with col1:
-                if st.button("Check Status", key="status_btn", use_container_width=True):
-                    with st.spinner("Retrieving intake status..."):
-                        status = get_intake_status(st.session_state.intake_id)
-                        if status:
-                            st.json(status)
+            uploaded_files = st.file_uploader(
+                "Choose files",
+                type=["txt", "md", "pdf", "docx"],
+                accept_multiple_files=True,
+                help="Supported formats: .txt, .md, .pdf, .docx (Max 10MB each)",
+                label_visibility="collapsed",
+                key="batch_file_uploader"
+            )
             
-            with col2:
-                if st.button("Finalize Intake", key="finalize_btn", use_container_width=True):
-                    with st.spinner("Finalizing intake session..."):
-                        finalize_intake(st.session_state.intake_id)
-            
-            with col3:
-                if st.button("Reset Session", key="reset_btn", use_container_width=True):
-                    reset_session()
+            if uploaded_files:
+                st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{len(uploaded_files)}</div>
+                        <div class="metric-label">Files</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    total_size_mb = sum(f.size for f in uploaded_files) / (1024 * 1024)
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{total_size_mb:.1f}</div>
+                        <div class="metric-label">Total MB</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    upload_batch_btn = st.button(f"Upload {len(uploaded_files)} Files", key="upload_batch_btn", use_container_width=True)
+                
+                if upload_batch_btn:
+                    upload_files_batch(st.session_state.intake_id, uploaded_files)
         
-        else:
-            st.markdown("""
-            <div class="empty-state">
-                <h3>Ready to Start?</h3>
-                <p>Initialize an intake session above to begin uploading and analyzing your content.</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with tab2:
-        intakes_history_tab()
-
-    with tab3:
+        # Management Section - Divider
+        st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+        
+        # Management Section
         st.markdown("""
         <div class="card">
             <div class="card-header">
-                <h2>Query AI Insights</h2>
-                <p>Ask questions about your data and get intelligent, contextual insights powered by Pulse</p>
+                <h2>Session Management</h2>
+                <p>Manage your current intake session and finalize your data to add it to the Pulse knowledge base</p>
             </div>
         </div>
         """, unsafe_allow_html=True)
         
-        # Query input
-        query_text = st.text_area(
-            "Ask a question about your data",
-            placeholder="Ask questions about your uploaded content...",
-            height=150,
-            help="Ask specific questions about your uploaded content to get AI-powered insights"
-        )
+        # Current session info
+        st.markdown(f"""
+        <div style="background: var(--bg-secondary); 
+                    border: 1px solid var(--border); 
+                    border-radius: var(--radius-lg); 
+                    padding: 1.5rem; 
+                    margin-bottom: 1.5rem;">
+            <h4 style="margin: 0 0 0.5rem 0; color: var(--primary); font-weight: 600;">Current Session</h4>
+            <p style="margin: 0; font-family: 'JetBrains Mono', monospace; font-size: 0.875rem; color: var(--text-secondary); background: var(--bg-tertiary); padding: 0.75rem; border-radius: var(--radius); border: 1px solid var(--border-light);">
+                <strong>Intake ID:</strong> {st.session_state.intake_id}
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Action buttons
+        col1, col2, col3 = st.columns(3)
         
-        col1, col2 = st.columns([3, 1])
         with col1:
-            query_btn = st.button("Get AI Insights", key="query_btn", disabled=not query_text.strip(), use_container_width=True)
+            if st.button("Check Status", key="status_btn", use_container_width=True):
+                start_status_watcher(st.session_state.intake_id)
         
         with col2:
-            if hasattr(st.session_state, 'last_query_response'):
-                if st.button("Clear Results", key="clear_results", use_container_width=True):
-                    if hasattr(st.session_state, 'last_query_response'):
-                        delattr(st.session_state, 'last_query_response')
-                    if hasattr(st.session_state, 'last_query'):
-                        delattr(st.session_state, 'last_query')
-                    st.rerun()
+            if st.button("Finalize Intake", key="finalize_btn", use_container_width=True):
+                with st.spinner("Finalizing intake session..."):
+                    if finalize_intake(st.session_state.intake_id):
+                        start_status_watcher(st.session_state.intake_id)
         
-        if query_btn:
-            with st.spinner("Analyzing..."):
-                response = query_insights(query_text)
-                if response:
-                    st.session_state.last_query_response = response
-                    st.session_state.last_query = query_text
+        with col3:
+            if st.button("Reset Session", key="reset_btn", use_container_width=True):
+                reset_session()
         
-        # Display response
-        if hasattr(st.session_state, 'last_query_response') and st.session_state.last_query_response:
-            st.markdown("---")
-            st.markdown("### Response")
-            
-            # Show the question in a clean format
-            st.markdown(f"**Question:** {st.session_state.get('last_query', 'Previous query')}")
-            st.markdown("")
-            
-            # Display the response content
-            response = st.session_state.last_query_response
-            if isinstance(response, dict):
-                if 'answer' in response:
-                    st.markdown(response['answer'])
-                elif 'insights' in response:
-                    st.markdown(response['insights'])
-                elif 'response' in response:
-                    st.markdown(response['response'])
-                else:
-                    # Format JSON response nicely
-                    st.markdown("**Response Data:**")
-                    st.json(response)
-            else:
-                st.markdown(str(response))
-
-    # Meeting Assistant Tab
-    with tab4:
+        # Live status region, refreshed on its own while the watcher polls
+        watcher = st.session_state.get("status_watcher")
+        if watcher is not None and watcher.intake_id == st.session_state.intake_id:
+            live = watcher.is_running
+            st.fragment(intake_status_region, run_every=STATUS_REFRESH_INTERVAL if live else None)(live)
+    
+    else:
         st.markdown("""
-        <div class="card">
-            <div class="card-header">
-                <h2>Meeting Assistant</h2>
-                <p>Add Scooby AI to your meetings</p>
-            </div>
+        <div class="empty-state">
+            <h3>Ready to Start?</h3>
+            <p>Initialize an intake session above to begin uploading and analyzing your content.</p>
         </div>
         """, unsafe_allow_html=True)
+
+def query_history_panel():
+    """Searchable list of the org's past questions; showing one needs no API call"""
+    store = init_query_history()
+    with st.expander("🕘 Query History"):
+        search = st.text_input(
+            "Search past questions and answers",
+            placeholder="e.g. action items budget",
+            key="query_history_search"
+        )
+        entries = store.search(st.session_state.org_id, search)
+        if not entries:
+            st.caption("No matching questions yet." if search.strip() else "Questions you ask will appear here.")
+            return
         
-        # Meeting link input section
-        st.markdown("#### Meeting Details")
-        st.write("Enter your meeting link below to add Scooby to your meeting.")
+        now = datetime.now(timezone.utc)
+        for entry in entries:
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                question = entry["question"] if len(entry["question"]) <= 120 else entry["question"][:117] + "..."
+                st.markdown(f"**{question}**")
+                details = [format_relative(datetime.fromtimestamp(entry["created_at"], timezone.utc), now)]
+                if entry["elapsed"]:
+                    details.append(f"answered in {entry['elapsed']:.1f}s")
+                st.caption(" • ".join(details))
+            with col2:
+                if st.button("Show", key=f"history_show_{entry['id']}", use_container_width=True):
+                    stored = store.get(st.session_state.org_id, entry["id"])
+                    if stored:
+                        st.session_state.last_query_response = stored["response"]
+                        st.session_state.last_query = stored["question"]
+                        st.session_state.last_query_cached_at = None
+                        st.session_state.last_query_history_at = stored["created_at"]
+                        st.rerun()
         
-        meeting_link = st.text_input(
-            "Meeting Link",
-            placeholder="https://meet.google.com/xyz-abcd-123 or https://zoom.us/j/1234567890",
-            help="Enter the full meeting URL (Google Meet, Zoom, Microsoft Teams, etc.)",
-            key="meeting_link_input"
-        )
+        if st.button("Clear History", key="clear_query_history"):
+            store.clear(st.session_state.org_id)
+            st.rerun()
+
+def query_insights_tab():
+    """Query Insights section"""
+    st.markdown("""
+    <div class="card">
+        <div class="card-header">
+            <h2>Query AI Insights</h2>
+            <p>Ask questions about your data and get intelligent, contextual insights powered by Pulse</p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    single_tab, batch_tab = st.tabs(["Single Question", "Batch Questions"])
+    with single_tab:
+        single_query_section()
+    with batch_tab:
+        batch_query_section()
+
+def single_query_section():
+    """Ask one question and show its answer"""
+    # Query input
+    query_text = st.text_area(
+        "Ask a question about your data",
+        placeholder="Ask questions about your uploaded content...",
+        height=150,
+        help="Ask specific questions about your uploaded content to get AI-powered insights",
+        key="query_text_input"
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query_btn = st.button("Get AI Insights", key="query_btn", disabled=not query_text.strip(), use_container_width=True)
+    
+    with col2:
+        if hasattr(st.session_state, 'last_query_response'):
+            if st.button("Clear Results", key="clear_results", use_container_width=True):
+                if hasattr(st.session_state, 'last_query_response'):
+                    delattr(st.session_state, 'last_query_response')
+                if hasattr(st.session_state, 'last_query'):
+                    delattr(st.session_state, 'last_query')
+                if hasattr(st.session_state, 'last_query_cached_at'):
+                    delattr(st.session_state, 'last_query_cached_at')
+                if hasattr(st.session_state, 'last_query_history_at'):
+                    delattr(st.session_state, 'last_query_history_at')
+                st.rerun()
+    
+    query_history_panel()
+    
+    if query_btn:
+        cached = get_cached_answer(st.session_state.org_id, query_text)
+        if cached is not None:
+            st.session_state.last_query_response = cached["response"]
+            st.session_state.last_query = query_text
+            st.session_state.last_query_cached_at = cached["cached_at"]
+            st.session_state.last_query_history_at = None
+        else:
+            # Stream the answer in place, then rerun to show it with the regular layout below
+            st.markdown("---")
+            st.markdown("### Response")
+            st.markdown(f"**Question:** {query_text}")
+            response = stream_query_insights(query_text)
+            if response:
+                st.session_state.last_query_response = response
+                st.session_state.last_query = query_text
+                st.session_state.last_query_cached_at = None
+                st.session_state.last_query_history_at = None
+                st.rerun()
+    
+    # Display response
+    if hasattr(st.session_state, 'last_query_response') and st.session_state.last_query_response:
+        st.markdown("---")
+        st.markdown("### Response")
         
-        # Display meeting link info if provided
-        if meeting_link.strip():
-            st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
-            
-            col1, col2, col3 = st.columns(3)
-            
+        # Show the question in a clean format
+        st.markdown(f"**Question:** {st.session_state.get('last_query', 'Previous query')}")
+        
+        cached_at = st.session_state.get('last_query_cached_at')
+        history_at = st.session_state.get('last_query_history_at')
+        if cached_at or history_at:
+            col1, col2 = st.columns([3, 1])
             with col1:
-                # Detect meeting platform
-                platform = "Unknown"
-                if "meet.google.com" in meeting_link.lower():
-                    platform = "Google Meet"
-                elif "zoom.us" in meeting_link.lower():
-                    platform = "Zoom"
-                elif "teams.microsoft.com" in meeting_link.lower():
-                    platform = "Microsoft Teams" 
-                elif "webex" in meeting_link.lower():
-                    platform = "Webex"
-                
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value" style="font-size: 1rem;">{platform}</div>
-                    <div class="metric-label">Platform</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
+                answered = format_relative(datetime.fromtimestamp(cached_at or history_at, timezone.utc), datetime.now(timezone.utc))
+                if cached_at:
+                    st.caption(f"⚡ From cache • answered {answered.lower()}")
+                else:
+                    st.caption(f"🕘 From history • answered {answered.lower()}")
             with col2:
-                # Meeting link validation
-                is_valid = any(domain in meeting_link.lower() for domain in ['meet.google.com', 'zoom.us', 'teams.microsoft.com', 'webex'])
-                status_text = "Valid" if is_valid else "Check Link"
-                
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value" style="font-size: 1rem;">{status_text}</div>
-                    <div class="metric-label">Status</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                # Link length indicator
-                link_length = len(meeting_link)
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{link_length}</div>
-                    <div class="metric-label">Characters</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+                if st.button("Ask Again", key="requery_btn", use_container_width=True):
+                    with st.spinner("Analyzing..."):
+                        response = query_insights(st.session_state.last_query)
+                        if response:
+                            st.session_state.last_query_response = response
+                            st.session_state.last_query_cached_at = None
+                            st.session_state.last_query_history_at = None
+                            st.rerun()
+        st.markdown("")
+        
+        # Display the response content
+        response = st.session_state.last_query_response
+        if isinstance(response, dict):
+            if 'answer' in response:
+                st.markdown(response['answer'])
+            elif 'insights' in response:
+                st.markdown(response['insights'])
+            elif 'response' in response:
+                st.markdown(response['response'])
+            else:
+                # Format JSON response nicely
+                st.markdown("**Response Data:**")
+                st.json(response)
+        else:
+            st.markdown(str(response))
+
+def _render_batch_answer(result: dict):
+    """One answered (or failed) question of a batch"""
+    st.markdown(f"**{result['question']}**")
+    if result["error"]:
+        st.error(result["error"])
+        return
+    st.markdown(answer_text(result["response"]))
+    if result["cached_at"]:
+        st.caption("⚡ From cache")
+    else:
+        st.caption(f"Answered in {result['elapsed']:.1f}s")
+
+def run_batch_queries(questions: list) -> list:
+    """Answer questions concurrently, rendering each answer as soon as it completes"""
+    org_id = st.session_state.org_id
+    results = [None] * len(questions)
+    slots = []
+    for question in questions:
+        slot = st.empty()
+        slot.markdown(f"⏳ **{question}** — Waiting for answer...")
+        slots.append(slot)
+    
+    # Answers already in the shared cache need no request
+    pending = []
+    for index, question in enumerate(questions):
+        cached = get_cached_answer(org_id, question)
+        if cached is None:
+            pending.append(index)
+            continue
+        results[index] = {"question": question, "response": cached["response"], "error": None,
+                          "elapsed": 0.0, "cached_at": cached["cached_at"]}
+        with slots[index].container():
+            _render_batch_answer(results[index])
+    
+    for position, response, error, elapsed in ask_questions_concurrently(org_id, [questions[i] for i in pending]):
+        index = pending[position]
+        if response is not None:
+            remember_answer(questions[index], response, elapsed)
+        results[index] = {"question": questions[index], "response": response, "error": error,
+                          "elapsed": elapsed, "cached_at": None}
+        with slots[index].container():
+            _render_batch_answer(results[index])
+    return results
+
+def batch_query_section():
+    """Ask several questions at once; they run concurrently and answers appear as they complete"""
+    batch_text = st.text_area(
+        "Questions (one per line)",
+        placeholder="What were the action items?\nWho owns the budget?\nWhat risks were raised?",
+        height=180,
+        help=f"Up to {MAX_BATCH_QUESTIONS} questions are asked at the same time",
+        key="batch_questions_input"
+    )
+    questions = parse_questions(batch_text)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        label = f"Ask {len(questions)} Questions" if len(questions) > 1 else "Ask Questions"
+        batch_btn = st.button(label, key="batch_query_btn", disabled=not questions, use_container_width=True)
+    with col2:
+        if st.session_state.get("batch_query_results"):
+            if st.button("Clear Answers", key="clear_batch_results", use_container_width=True):
+                del st.session_state["batch_query_results"]
+                st.rerun()
+    
+    if batch_btn:
+        st.markdown("---")
+        start = time.perf_counter()
+        results = run_batch_queries(questions)
+        st.session_state.batch_query_results = {"results": results, "elapsed": time.perf_counter() - start}
+        st.rerun()
+    
+    batch = st.session_state.get("batch_query_results")
+    if batch:
+        st.markdown("---")
+        results = batch["results"]
+        failed = sum(1 for result in results if result["error"])
+        summary = f"{len(results) - failed} of {len(results)} questions answered in {batch['elapsed']:.1f}s"
+        sequential = sum(result["elapsed"] for result in results)
+        if sequential > batch["elapsed"]:
+            summary += f" (one at a time: {sequential:.1f}s)"
+        st.caption(summary)
+        for result in results:
+            with st.container(border=True):
+                _render_batch_answer(result)
+
+def meeting_assistant_tab():
+    """Meeting Assistant section"""
+    st.markdown("""
+    <div class="card">
+        <div class="card-header">
+            <h2>Meeting Assistant</h2>
+            <p>Add Scooby AI to your meetings</p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Meeting link input section
+    st.markdown("#### Meeting Details")
+    st.write("Enter your meeting link below to add Scooby to your meeting.")
+    
+    meeting_link = st.text_input(
+        "Meeting Link",
+        placeholder="https://meet.google.com/xyz-abcd-123 or https://zoom.us/j/1234567890",
+        help="Enter the full meeting URL (Google Meet, Zoom, Microsoft Teams, etc.)",
+        key="meeting_link_input"
+    )
+    
+    # Display meeting link info if provided
+    if meeting_link.strip():
+        st.markdown('<div class="metrics-grid">', unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Detect meeting platform
+            platform = "Unknown"
+            if "meet.google.com" in meeting_link.lower():
+                platform = "Google Meet"
+            elif "zoom.us" in meeting_link.lower():
+                platform = "Zoom"
+            elif "teams.microsoft.com" in meeting_link.lower():
+                platform = "Microsoft Teams" 
+            elif "webex" in meeting_link.lower():
+                platform = "Webex"
             
-            # Meeting link preview
             st.markdown(f"""
-            <div style="background: var(--bg-tertiary); border: 1px solid var(--border); border-radius: var(--radius); 
-                        padding: 1rem; margin: 1rem 0; font-family: 'JetBrains Mono', monospace; 
-                        font-size: 0.875rem; word-break: break-all; color: var(--text-secondary);">
-                <strong>Meeting Link:</strong><br>{meeting_link}
+            <div class="metric-card">
+                <div class="metric-value" style="font-size: 1rem;">{platform}</div>
+                <div class="metric-label">Platform</div>
             </div>
             """, unsafe_allow_html=True)
+        
+        with col2:
+            # Meeting link validation
+            is_valid = any(domain in meeting_link.lower() for domain in ['meet.google.com', 'zoom.us', 'teams.microsoft.com', 'webex'])
+            status_text = "Valid" if is_valid else "Check Link"
             
-            # Add Scooby button
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button("Add Scooby to Meeting", key="add_scooby_btn", use_container_width=True, disabled=not meeting_link.strip()):
-                    with st.spinner("Adding Scooby to your meeting..."):
-                        add_scooby_to_meeting(meeting_link)
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value" style="font-size: 1rem;">{status_text}</div>
+                <div class="metric-label">Status</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            # Link length indicator
+            link_length = len(meeting_link)
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{link_length}</div>
+                <div class="metric-label">Characters</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Meeting link preview
+        st.markdown(f"""
+        <div style="background: var(--bg-tertiary); border: 1px solid var(--border); border-radius: var(--radius); 
+                    padding: 1rem; margin: 1rem 0; font-family: 'JetBrains Mono', monospace; 
+                    font-size: 0.875rem; word-break: break-all; color: var(--text-secondary);">
+            <strong>Meeting Link:</strong><br>{meeting_link}
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Add Scooby button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("Add Scooby to Meeting", key="add_scooby_btn", use_container_width=True, disabled=not meeting_link.strip()):
+                with st.spinner("Adding Scooby to your meeting..."):
+                    add_scooby_to_meeting(meeting_link)
+
+def metrics_panel_tab():
+    """Upstream Metrics admin section"""
+    st.markdown("""
+    <div class="card">
+        <div class="card-header">
+            <h2>Upstream Metrics</h2>
+            <p>Latency, status codes and traffic of every outbound call made by this server process</p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if st.button("Refresh", key="refresh_metrics"):
+        st.rerun()
+    
+    snapshot = metrics.registry.snapshot()
+    if not snapshot:
+        st.info("No outbound calls recorded yet.")
+        return
+    
+    rows = []
+    for endpoint, stats in sorted(snapshot.items(), key=lambda item: -item[1]["latency_sum"]):
+        errors = sum(count for status, count in stats["statuses"].items() if not status.startswith("2") and status != "ok")
+        rows.append({
+            "Endpoint": endpoint,
+            "Calls": stats["count"],
+            "Errors": errors,
+            "Mean (s)": round(stats["latency_sum"] / stats["count"], 3),
+            "p50 ≤ (s)": metrics.registry.quantile(stats, 0.5),
+            "p95 ≤ (s)": metrics.registry.quantile(stats, 0.95),
+            "Total time (s)": round(stats["latency_sum"], 2),
+            "Sent (KB)": round(stats["request_bytes"] / 1024, 1),
+            "Received (KB)": round(stats["response_bytes"] / 1024, 1),
+            "Compression": (
+                f"{stats['compression_input_bytes'] / stats['compression_output_bytes']:.1f}x, "
+                f"saved {(stats['compression_input_bytes'] - stats['compression_output_bytes']) / 1024:.1f} KB"
+                if stats["compression_output_bytes"] else ""
+            ),
+            "Statuses": ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items())),
+        })
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    
+    circuits = api_client.circuit_states()
+    if circuits:
+        icons = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}
+        st.caption("Circuit breakers: " + " • ".join(f"{icons[state]} {host} ({state})" for host, state in sorted(circuits.items())))
+    
+    with st.expander("Prometheus format"):
+        st.code(metrics.registry.render_prometheus(), language="text")
+
+# Sections of the main app, in navigation order
+APP_SECTIONS = {
+    "Data Intake & Management": intake_tab,
+    "Intakes History": intakes_history_tab,
+    "Query Insights": query_insights_tab,
+    "Meeting Assistant": meeting_assistant_tab,
+}
+if SHOW_METRICS_PANEL:
+    APP_SECTIONS["Upstream Metrics"] = metrics_panel_tab
+
+# Widget values that survive switching to another section
+PERSISTED_WIDGET_KEYS = ["text_content_input", "query_text_input", "query_history_search", "batch_questions_input", "allow_duplicate_uploads", "meeting_link_input", "page_size_selector"]
+
+def main_app():
+    """Main application with clean, professional design"""
+    st.set_page_config(
+        page_title="Pulse Copilot - Dashboard",
+        page_icon="⚡",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+    
+    inject_styles()
+    
+    # Clean Header
+    org_initial = st.session_state.org_name[0].upper() if st.session_state.org_name else "O"
+    
+    st.markdown(f"""
+    <div class="app-header">
+        <div class="header-content">
+            <div class="brand-section">
+                <h1>Pulse Copilot</h1>
+            </div>
+            <div class="user-section">
+                <div class="user-avatar">{org_initial}</div>
+                <div class="user-info">
+                    <h4>{st.session_state.org_name}</h4>
+                    <p>ID: {st.session_state.org_id}</p>
+                </div>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Logout button
+    col1, col2, col3 = st.columns([6, 1, 2])
+    with col3:
+        if st.button("Sign Out", key="logout_btn", use_container_width=True):
+            logout()
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Initialize session state
+    if "intake_id" not in st.session_state:
+        st.session_state.intake_id = None
+    if "intake_initialized" not in st.session_state:
+        st.session_state.intake_initialized = False
+    if "idempotency_key" not in st.session_state:
+        st.session_state.idempotency_key = None
+    
+    # Keep the values of widgets in sections that aren't rendered on this run
+    for key in PERSISTED_WIDGET_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+    
+    # Section navigation: only the selected section's code runs on each rerun
+    section = st.radio(
+        "Section",
+        options=list(APP_SECTIONS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_section"
+    )
+    
+    APP_SECTIONS[section]()
 
 def main():
     """Main function to route between login and app"""
+    init_metrics_server()
+    
     # Track session start time
     if "session_start" not in st.session_state:
         st.session_state.session_start = time.time()
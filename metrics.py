@@ -0,0 +1,160 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_PREFIX = "pulse_upstream"
+
+class _EndpointStats:
+    """Counters and latency histogram of one upstream endpoint"""
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * (bucket_count + 1)  # last slot is +Inf
+        self.latency_sum = 0.0
+        self.count = 0
+        self.statuses = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.compression_input_bytes = 0
+        self.compression_output_bytes = 0
+
+class MetricsRegistry:
+    """Process-wide latency, status and byte counters for outbound calls"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, seconds: float, status, request_bytes: int = 0, response_bytes: int = 0):
+        """Record one completed (or failed) call"""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _EndpointStats(len(self.buckets))
+            stats.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            stats.latency_sum += seconds
+            stats.count += 1
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def observe_compression(self, endpoint: str, input_bytes: int, output_bytes: int):
+        """Record a request body sent compressed: its size before and after encoding"""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _EndpointStats(len(self.buckets))
+            stats.compression_input_bytes += input_bytes
+            stats.compression_output_bytes += output_bytes
+
+    @contextmanager
+    def timed(self, endpoint: str):
+        """Time the body of a with block; set call["status"] and byte counts inside it if known"""
+        call = {"status": "ok", "request_bytes": 0, "response_bytes": 0}
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            call["status"] = type(e).__name__
+            raise
+        finally:
+            self.observe(endpoint, time.perf_counter() - start, call["status"],
+                         call["request_bytes"], call["response_bytes"])
+
+    def snapshot(self) -> dict:
+        """Copy of the per-endpoint stats, safe to read while calls are recorded"""
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": stats.count,
+                    "latency_sum": stats.latency_sum,
+                    "bucket_counts": list(stats.bucket_counts),
+                    "statuses": dict(stats.statuses),
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "compression_input_bytes": stats.compression_input_bytes,
+                    "compression_output_bytes": stats.compression_output_bytes,
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def quantile(self, endpoint_stats: dict, q: float) -> float:
+        """Estimate a latency quantile as the upper bound of the bucket that holds it"""
+        target = q * endpoint_stats["count"]
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), endpoint_stats["bucket_counts"]):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return float("inf")
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_request_duration_seconds Latency of outbound calls.",
+            f"# TYPE {METRIC_PREFIX}_request_duration_seconds histogram",
+        ]
+        for endpoint, stats in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), stats["bucket_counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{METRIC_PREFIX}_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_request_duration_seconds_sum{{endpoint="{endpoint}"}} {stats["latency_sum"]}')
+            lines.append(f'{METRIC_PREFIX}_request_duration_seconds_count{{endpoint="{endpoint}"}} {stats["count"]}')
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_requests_total Outbound calls by endpoint and status.",
+            f"# TYPE {METRIC_PREFIX}_requests_total counter",
+        ]
+        for endpoint, stats in sorted(snapshot.items()):
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(f'{METRIC_PREFIX}_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+        for direction in ("request", "response"):
+            lines += [
+                f"# HELP {METRIC_PREFIX}_{direction}_bytes_total Bytes of {direction} bodies.",
+                f"# TYPE {METRIC_PREFIX}_{direction}_bytes_total counter",
+            ]
+            for endpoint, stats in sorted(snapshot.items()):
+                lines.append(f'{METRIC_PREFIX}_{direction}_bytes_total{{endpoint="{endpoint}"}} {stats[direction + "_bytes"]}')
+
+        for side, help_text in (("input", "before"), ("output", "after")):
+            lines += [
+                f"# HELP {METRIC_PREFIX}_compression_{side}_bytes_total Bytes of compressed request bodies {help_text} encoding.",
+                f"# TYPE {METRIC_PREFIX}_compression_{side}_bytes_total counter",
+            ]
+            for endpoint, stats in sorted(snapshot.items()):
+                if stats["compression_input_bytes"]:
+                    lines.append(f'{METRIC_PREFIX}_compression_{side}_bytes_total{{endpoint="{endpoint}"}} {stats["compression_" + side + "_bytes"]}')
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve the registry at http://host:port/metrics from a background thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
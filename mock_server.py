@@ -0,0 +1,403 @@
+"""Local stand-in for the Pulse API, the Scooby bot API and the Supabase tables the app uses.
+
+Run with:
+    python mock_server.py --port 8787 --latency 0.05 --error-rate 0.1
+
+Then point the app at it:
+    PULSE_API_BASE_URL=http://127.0.0.1:8787 PULSE_BOT_URL=http://127.0.0.1:8787 \
+    PULSE_SUPABASE_URL=http://127.0.0.1:8787 PULSE_SUPABASE_ANON_KEY=mock-anon-key \
+    streamlit run meeting_summary_app.py
+
+and sign in as organization "demo" with password "demo".
+"""
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+DEMO_ORG_ID = "00000000-0000-4000-8000-000000000001"
+DEMO_TENANT_ID = "00000000-0000-4000-8000-000000000002"
+
+MEMORY_KINDS = ["meeting", "email", "document", "conversation", "decision", "note"]
+
+class MockState:
+    """In-memory data and fault-injection settings behind the mock server"""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, endpoint_latency: dict = None,
+                 memory_count: int = 60, summary_bytes: int = 400, answer_bytes: int = 2000,
+                 processing_seconds: float = 5.0, stream_answers: bool = False, token_delay: float = 0.02,
+                 request_encodings: tuple = ("gzip", "deflate")):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.endpoint_latency = endpoint_latency or {}
+        self.summary_bytes = summary_bytes
+        self.answer_bytes = answer_bytes
+        self.processing_seconds = processing_seconds
+        self.stream_answers = stream_answers
+        self.token_delay = token_delay
+        self.request_encodings = request_encodings
+        self.lock = threading.Lock()
+        self.intakes = {}
+        self.uploads = {}
+        self.parts = {}
+        self.idempotency_keys = {}
+        self.request_count = 0
+        self.requests_by_endpoint = {}
+        self.bytes_received = 0
+        self.tables = {
+            "orgs": [{"id": DEMO_ORG_ID, "org_name": "demo", "password": "demo"}],
+            "org_directory": [{"org_id": DEMO_ORG_ID, "tenant_id": DEMO_TENANT_ID}],
+        }
+        self.memories = self._generate_memories(memory_count)
+
+    def _generate_memories(self, count: int) -> list:
+        """Build newest-first memories with summaries of about summary_bytes each"""
+        now = datetime.now(timezone.utc)
+        filler = "Discussed the roadmap, owners and follow-ups. "
+        memories = []
+        for i in range(count):
+            kind = MEMORY_KINDS[i % len(MEMORY_KINDS)]
+            summary = (f"Summary of {kind} {i + 1}. " + filler * (self.summary_bytes // len(filler) + 1))[:self.summary_bytes]
+            memories.append({
+                "id": str(uuid.UUID(int=i + 1)),
+                "title": f"{kind.title()} {i + 1}",
+                "summary": summary,
+                "created_at": (now - timedelta(minutes=37 * i)).isoformat().replace("+00:00", "Z"),
+            })
+        return memories
+
+    def intake_status(self, intake_id: str) -> dict:
+        """Current status of an intake; finalized intakes complete after processing_seconds"""
+        intake = self.intakes.get(intake_id)
+        if intake is None:
+            return None
+        status = intake["status"]
+        if status == "processing" and time.time() - intake["finalized_at"] >= self.processing_seconds:
+            status = intake["status"] = "completed"
+        return {"intake_id": intake_id, "status": status, "uploads": len(self.uploads.get(intake_id, []))}
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the mock endpoints"""
+
+    protocol_version = "HTTP/1.1"
+
+    routes = [
+        ("POST", re.compile(r"^/api/intakes/init$"), "init_intake"),
+        ("POST", re.compile(r"^/api/intakes/(?P<intake_id>[^/]+)/finalize$"), "finalize_intake"),
+        ("GET", re.compile(r"^/api/intakes/(?P<intake_id>[^/]+)$"), "get_intake_status"),
+        ("POST", re.compile(r"^/api/upload/file/(?P<intake_id>[^/]+)/parts/(?P<part_number>\d+)$"), "upload_part"),
+        ("POST", re.compile(r"^/api/upload/file/(?P<intake_id>[^/]+)/complete$"), "complete_upload"),
+        ("POST", re.compile(r"^/api/upload/file/(?P<intake_id>[^/]+)$"), "upload_file"),
+        ("POST", re.compile(r"^/api/upload/text/(?P<intake_id>[^/]+)$"), "upload_text"),
+        ("POST", re.compile(r"^/api/query$"), "query_insights"),
+        ("GET", re.compile(r"^/api/memories$"), "get_memories"),
+        ("POST", re.compile(r"^/add_scooby$"), "add_scooby"),
+        ("GET", re.compile(r"^/rest/v1/(?P<table>[a-z_]+)$"), "select_rows"),
+    ]
+
+    @property
+    def state(self) -> MockState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        parts = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        body = self._read_body()
+        for route_method, pattern, handler_name in self.routes:
+            match = pattern.match(parts.path)
+            if route_method == method and match:
+                with self.state.lock:
+                    self.state.request_count += 1
+                    self.state.bytes_received += len(body)
+                    self.state.requests_by_endpoint[handler_name] = self.state.requests_by_endpoint.get(handler_name, 0) + 1
+                latency = self.state.endpoint_latency.get(handler_name, self.state.latency)
+                if latency:
+                    time.sleep(latency)
+                if self.state.error_rate and random.random() < self.state.error_rate:
+                    self._send_json(503, {"detail": "Injected failure"})
+                    return
+                body = self._decode_body(body)
+                if body is None:
+                    self._send_json(415, {"detail": f"Unsupported Content-Encoding: {self.headers.get('Content-Encoding')}"})
+                    return
+                self.endpoint = handler_name
+                getattr(self, handler_name)(body, **match.groupdict())
+                return
+        self._send_json(404, {"detail": "Not found"})
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            return self._read_chunked_body()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _read_chunked_body(self) -> bytes:
+        """Read a request body sent with chunked transfer encoding (streamed uploads have no Content-Length)"""
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                break
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        # Skip trailer headers up to the blank line ending the body
+        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+            pass
+        return b"".join(chunks)
+
+    def _decode_body(self, body: bytes) -> Optional[bytes]:
+        """Undo the request's Content-Encoding, or None if the encoding is not accepted"""
+        encoding = self.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding == "identity":
+            return body
+        if encoding not in self.state.request_encodings:
+            return None
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            return zlib.decompress(body)
+        return None
+
+    def _send_json(self, status: int, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _replayed_response(self):
+        """Response stored for this request's idempotency key on this endpoint, if it was seen before"""
+        key = self.headers.get("x-idempotency-key")
+        with self.state.lock:
+            return self.state.idempotency_keys.get((self.endpoint, key)) if key else None
+
+    def _remember_response(self, payload):
+        key = self.headers.get("x-idempotency-key")
+        if key:
+            with self.state.lock:
+                self.state.idempotency_keys.setdefault((self.endpoint, key), payload)
+
+    # Pulse API
+
+    def init_intake(self, body: bytes):
+        payload = self._replayed_response()
+        if payload is None:
+            intake_id = str(uuid.uuid4())
+            with self.state.lock:
+                self.state.intakes[intake_id] = {"status": "initialized", "finalized_at": None}
+            payload = {"intake_id": intake_id}
+            self._remember_response(payload)
+        self._send_json(200, payload)
+
+    def get_intake_status(self, body: bytes, intake_id: str):
+        with self.state.lock:
+            status = self.state.intake_status(intake_id)
+        if status is None:
+            self._send_json(404, {"detail": "Intake not found"})
+            return
+        self._send_json(200, status)
+
+    def finalize_intake(self, body: bytes, intake_id: str):
+        with self.state.lock:
+            intake = self.state.intakes.get(intake_id)
+            if intake is not None and intake["status"] == "initialized":
+                intake["status"] = "processing"
+                intake["finalized_at"] = time.time()
+        if intake is None:
+            self._send_json(404, {"detail": "Intake not found"})
+            return
+        self._send_json(200, {"intake_id": intake_id, "status": intake["status"]})
+
+    def _record_upload(self, intake_id: str, size: int) -> dict:
+        payload = self._replayed_response()
+        if payload is None:
+            with self.state.lock:
+                self.state.uploads.setdefault(intake_id, []).append(size)
+            payload = {"intake_id": intake_id, "bytes": size}
+            self._remember_response(payload)
+        return payload
+
+    def upload_file(self, body: bytes, intake_id: str):
+        self._send_json(200, self._record_upload(intake_id, len(body)))
+
+    def upload_text(self, body: bytes, intake_id: str):
+        self._send_json(200, self._record_upload(intake_id, len(body)))
+
+    def upload_part(self, body: bytes, intake_id: str, part_number: str):
+        upload_id = self.headers.get("x-upload-id", "")
+        with self.state.lock:
+            self.state.parts.setdefault(upload_id, {})[int(part_number)] = len(body)
+        self._send_json(200, {"upload_id": upload_id, "part_number": int(part_number)})
+
+    def complete_upload(self, body: bytes, intake_id: str):
+        payload = json.loads(body or b"{}")
+        upload_id = payload.get("upload_id", "")
+        with self.state.lock:
+            parts = dict(self.state.parts.get(upload_id, {}))
+        missing = [n for n in range(payload.get("part_count", 0)) if n not in parts]
+        if missing:
+            self._send_json(409, {"detail": "Missing parts", "missing": missing})
+            return
+        self._send_json(200, self._record_upload(intake_id, sum(parts.values())))
+
+    def query_insights(self, body: bytes):
+        question = json.loads(body or b"{}").get("question", "")
+        sentence = f"Regarding '{question[:80]}': the team agreed on next steps and owners. "
+        answer = (sentence * (self.state.answer_bytes // len(sentence) + 1))[:self.state.answer_bytes]
+        if self.state.stream_answers and "text/event-stream" in self.headers.get("Accept", ""):
+            self._send_event_stream(re.findall(r"\S+\s*", answer))
+            return
+        self._send_json(200, {"answer": answer})
+
+    def _send_event_stream(self, tokens: list):
+        """Send tokens as server-sent events over a chunked response"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokens + [None]:
+            event = "data: [DONE]\n\n" if token is None else f"data: {json.dumps({'delta': token})}\n\n"
+            data = event.encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+            if token is not None and self.state.token_delay:
+                time.sleep(self.state.token_delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def get_memories(self, body: bytes):
+        page = max(1, int(self.query.get("page", 1)))
+        page_size = max(1, int(self.query.get("page_size", 15)))
+        memories = self.state.memories
+        total_pages = max(1, -(-len(memories) // page_size))
+        start = (page - 1) * page_size
+        self._send_json(200, {
+            "memories": memories[start:start + page_size],
+            "pagination": {
+                "page": page,
+                "page_size": page_size,
+                "total_count": len(memories),
+                "total_pages": total_pages,
+                "has_next": page < total_pages,
+                "has_prev": page > 1,
+            },
+        })
+
+    # Scooby bot API
+
+    def add_scooby(self, body: bytes):
+        payload = json.loads(body or b"{}")
+        if not payload.get("meeting_url"):
+            self._send_json(422, {"detail": "meeting_url is required"})
+            return
+        self._send_json(200, {"status": "joining", "meeting_url": payload["meeting_url"]})
+
+    # Supabase (PostgREST) tables
+
+    def select_rows(self, body: bytes, table: str):
+        rows = self.state.tables.get(table)
+        if rows is None:
+            self._send_json(404, {"code": "42P01", "message": f'relation "{table}" does not exist'})
+            return
+        columns, embeds = _parse_select(self.query.get("select", "*"))
+        filters = {k: v[3:] for k, v in self.query.items() if v.startswith("eq.")}
+        result = []
+        for row in rows:
+            if all(str(row.get(column)) == value for column, value in filters.items()):
+                result.append(self._project(table, row, columns, embeds))
+        if "limit" in self.query:
+            result = result[:int(self.query["limit"])]
+        self._send_json(200, result)
+
+    def _project(self, table: str, row: dict, columns: list, embeds: dict) -> dict:
+        projected = dict(row) if columns == ["*"] else {c: row.get(c) for c in columns}
+        for embed_table, embed_columns in embeds.items():
+            # Only orgs -> org_directory is related (org_directory.org_id references orgs.id)
+            related = [r for r in self.state.tables.get(embed_table, []) if table == "orgs" and r.get("org_id") == row.get("id")]
+            projected[embed_table] = [r if embed_columns == ["*"] else {c: r.get(c) for c in embed_columns} for r in related]
+        return projected
+
+def _parse_select(select: str) -> tuple:
+    """Split a PostgREST select into plain columns and embedded table(columns) parts"""
+    embeds = {}
+    for table, columns in re.findall(r"(\w+)\(([^)]*)\)", select):
+        embeds[table] = [c.strip() for c in columns.split(",")]
+    plain = re.sub(r"\w+\([^)]*\)", "", select)
+    columns = [c.strip() for c in plain.split(",") if c.strip()]
+    return columns or ["*"], embeds
+
+def _parse_endpoint_latency(values: list) -> dict:
+    """Parse NAME=SECONDS pairs given on the command line"""
+    latency = {}
+    for value in values:
+        name, seconds = value.split("=", 1)
+        latency[name] = float(seconds)
+    return latency
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, **state_options) -> ThreadingHTTPServer:
+    """Start the mock server on a background thread; its base URL is server.base_url"""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(**state_options)
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Pulse API, Scooby bot API and Supabase")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--endpoint-latency", nargs="*", default=[], metavar="NAME=SECONDS",
+                        help="Per-endpoint latency, e.g. query_insights=1.5 get_memories=0.2")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with 503")
+    parser.add_argument("--memories", type=int, default=60, help="Number of memories in history")
+    parser.add_argument("--summary-bytes", type=int, default=400, help="Size of each memory summary")
+    parser.add_argument("--answer-bytes", type=int, default=2000, help="Size of each query answer")
+    parser.add_argument("--processing-seconds", type=float, default=5.0, help="Time from finalize to completed")
+    parser.add_argument("--no-request-compression", action="store_true", help="Reject gzip/deflate request bodies with 415")
+    parser.add_argument("--stream", action="store_true", help="Stream query answers as server-sent events")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        endpoint_latency=_parse_endpoint_latency(args.endpoint_latency),
+        memory_count=args.memories,
+        summary_bytes=args.summary_bytes,
+        answer_bytes=args.answer_bytes,
+        processing_seconds=args.processing_seconds,
+        stream_answers=args.stream,
+        token_delay=args.token_delay,
+        request_encodings=() if args.no_request_compression else ("gzip", "deflate"),
+    )
+    print(f"Mock Pulse API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+import api_client
+from api_client import API_BASE_URL
+
+# Process-wide bound on concurrent /api/query calls, and the share one organization may use at once
+QUERY_BATCH_WORKERS = 8
+ORG_QUERY_CONCURRENCY = 4
+MAX_BATCH_QUESTIONS = 20
+
+_query_executor = ThreadPoolExecutor(max_workers=QUERY_BATCH_WORKERS, thread_name_prefix="batch-query")
+# Taken by the submitting thread and released when the query finishes, never held while waiting in a pool worker
+_org_slots = {}
+_org_slots_lock = threading.Lock()
+
+def _org_slot(org_id) -> threading.BoundedSemaphore:
+    with _org_slots_lock:
+        slot = _org_slots.get(str(org_id))
+        if slot is None:
+            slot = _org_slots[str(org_id)] = threading.BoundedSemaphore(ORG_QUERY_CONCURRENCY)
+        return slot
+
+def parse_questions(text: str) -> list[str]:
+    """One question per non-empty line, duplicates dropped, capped at MAX_BATCH_QUESTIONS"""
+    questions = []
+    seen = set()
+    for line in text.splitlines():
+        question = line.strip()
+        if question and question.lower() not in seen:
+            seen.add(question.lower())
+            questions.append(question)
+    return questions[:MAX_BATCH_QUESTIONS]
+
+def ask_question(org_id, question: str) -> tuple[Optional[dict], Optional[str], float]:
+    """Query /api/query without touching Streamlit state and return (result, error, seconds)"""
+    headers = {
+        "x-org-id": str(org_id),
+        "Content-Type": "application/json"
+    }
+    start = time.perf_counter()
+    try:
+        response = api_client.post("query_insights", f"{API_BASE_URL}/api/query", headers=headers, json={"question": question})
+        if response.status_code == 200:
+            return response.json(), None, time.perf_counter() - start
+        return None, f"Failed: {response.status_code}", time.perf_counter() - start
+    except Exception as e:
+        return None, f"Error: {str(e)}", time.perf_counter() - start
+
+def ask_questions_concurrently(org_id, questions: list):
+    """Ask questions on the shared pool, yielding (index, result, error, seconds) as each one finishes.
+
+    At most ORG_QUERY_CONCURRENCY questions of the org are submitted at a time; the
+    rest wait here, so one org's batch cannot fill the pool and starve other orgs.
+    """
+    slot = _org_slot(org_id)
+    remaining = iter(enumerate(questions))
+    next_question = next(remaining, None)
+    pending = {}
+    while next_question is not None or pending:
+        # Block for a free slot only when none of our own queries is in flight to wait on instead
+        while next_question is not None and slot.acquire(blocking=not pending):
+            index, question = next_question
+            try:
+                future = _query_executor.submit(ask_question, org_id, question)
+            except Exception:
+                slot.release()
+                raise
+            future.add_done_callback(lambda _: slot.release())
+            pending[future] = index
+            next_question = next(remaining, None)
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            result, error, elapsed = future.result()
+            yield pending.pop(future), result, error, elapsed
@@ -0,0 +1,31 @@
+import re
+import time
+from typing import Optional
+
+from cache import TTLCache
+
+# Answers are shared by every session of an org until they expire or the org finalizes an intake
+ANSWER_CACHE_TTL = 15 * 60
+ANSWER_CACHE_MAX_ENTRIES = 1024
+answer_cache = TTLCache(ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX_ENTRIES)
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+
+def normalize_question(question: str) -> str:
+    """Reduce a question to its cache key: lower-cased, single-spaced, no trailing punctuation"""
+    return _TRAILING_PUNCTUATION.sub("", " ".join(question.lower().split()))
+
+def get_cached_answer(org_id, question: str) -> Optional[dict]:
+    """Return {"response", "cached_at"} for a previously answered question, or None"""
+    return answer_cache.get((str(org_id), normalize_question(question)))
+
+def cache_answer(org_id, question: str, response):
+    """Store a successful answer for the org"""
+    answer_cache.set((str(org_id), normalize_question(question)), {"response": response, "cached_at": time.time()})
+
+def invalidate_answer_cache(org_id=None):
+    """Drop cached answers for one organization, or for all of them"""
+    if org_id is None:
+        answer_cache.invalidate()
+    else:
+        answer_cache.invalidate(lambda key: key[0] == str(org_id))
@@ -0,0 +1,120 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Local SQLite file holding every org's past questions and answers
+QUERY_HISTORY_PATH = os.environ.get("PULSE_QUERY_HISTORY_DB", os.path.join(".pulse", "query_history.sqlite3"))
+QUERY_HISTORY_PAGE_SIZE = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_history (
+    id INTEGER PRIMARY KEY,
+    org_id TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer_text TEXT NOT NULL,
+    response TEXT NOT NULL,
+    elapsed REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS query_history_org_created ON query_history (org_id, created_at DESC);
+"""
+
+# External-content FTS index kept in sync by triggers; optional, since not every SQLite build has FTS5
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS query_history_fts USING fts5(
+    question, answer_text, content='query_history', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS query_history_ai AFTER INSERT ON query_history BEGIN
+    INSERT INTO query_history_fts (rowid, question, answer_text) VALUES (new.id, new.question, new.answer_text);
+END;
+CREATE TRIGGER IF NOT EXISTS query_history_ad AFTER DELETE ON query_history BEGIN
+    INSERT INTO query_history_fts (query_history_fts, rowid, question, answer_text)
+    VALUES ('delete', old.id, old.question, old.answer_text);
+END;
+"""
+
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+def answer_text(response) -> str:
+    """The displayable text of an /api/query response"""
+    if isinstance(response, dict):
+        for key in ("answer", "insights", "response"):
+            if key in response:
+                return str(response[key])
+        return json.dumps(response)
+    return str(response)
+
+class QueryHistoryStore:
+    """Per-org history of answered questions with full-text search, stored in SQLite"""
+
+    def __init__(self, path: str = QUERY_HISTORY_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                self.full_text = False
+
+    def record(self, org_id, question: str, response, elapsed: Optional[float] = None) -> int:
+        """Store an answered question and return its id"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO query_history (org_id, question, answer_text, response, elapsed, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(org_id), question, answer_text(response), json.dumps(response), elapsed, time.time()),
+            )
+            return cursor.lastrowid
+
+    def search(self, org_id, text: str = "", limit: int = QUERY_HISTORY_PAGE_SIZE) -> list[dict]:
+        """Most recent entries of the org, optionally only those whose question or answer match text"""
+        terms = _SEARCH_TERM.findall(text)
+        columns = "h.id, h.question, h.answer_text, h.elapsed, h.created_at"
+        if not terms:
+            sql = f"SELECT {columns} FROM query_history h WHERE h.org_id = ? ORDER BY h.created_at DESC LIMIT ?"
+            params = (str(org_id), limit)
+        elif self.full_text:
+            # Every term must match, as a prefix so results appear while typing
+            match = " ".join(f'"{term}"*' for term in terms)
+            sql = (f"SELECT {columns} FROM query_history_fts f JOIN query_history h ON h.id = f.rowid "
+                   "WHERE query_history_fts MATCH ? AND h.org_id = ? ORDER BY h.created_at DESC LIMIT ?")
+            params = (match, str(org_id), limit)
+        else:
+            conditions = " AND ".join("(h.question LIKE ? OR h.answer_text LIKE ?)" for _ in terms)
+            sql = (f"SELECT {columns} FROM query_history h WHERE h.org_id = ? AND {conditions} "
+                   "ORDER BY h.created_at DESC LIMIT ?")
+            params = (str(org_id), *[f"%{term}%" for term in terms for _ in range(2)], limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def get(self, org_id, entry_id: int) -> Optional[dict]:
+        """One stored entry with its full response, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, question, response, elapsed, created_at FROM query_history WHERE org_id = ? AND id = ?",
+                (str(org_id), entry_id),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["response"] = json.loads(entry["response"])
+        return entry
+
+    def clear(self, org_id):
+        """Delete the org's whole history"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM query_history WHERE org_id = ?", (str(org_id),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# Intake states after which the status no longer changes
+TERMINAL_INTAKE_STATES = {"completed", "complete", "processed", "failed", "error", "cancelled", "canceled"}
+
+class IntakeStatusWatcher:
+    """Polls an intake's status on a background thread with exponential backoff and jitter.
+
+    fetch() must not use Streamlit and returns (status, error); the delay grows
+    while the status is unchanged or the poll failed, and drops back to the initial
+    delay when a successful poll shows the status moved.
+    """
+
+    def __init__(self, intake_id: str, fetch: Callable[[], tuple], initial_delay: float = 1.0,
+                 max_delay: float = 30.0, multiplier: float = 2.0, jitter: float = 0.2,
+                 max_duration: float = 30 * 60):
+        self.intake_id = intake_id
+        self.fetch = fetch
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_duration = max_duration
+        self.status = None
+        self.error = None
+        self.polls = 0
+        self.next_poll_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"intake-status-{intake_id[:8]}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def snapshot(self) -> dict:
+        """Latest polled state, safe to read from the script thread"""
+        with self._lock:
+            return {
+                "status": self.status,
+                "error": self.error,
+                "polls": self.polls,
+                "next_poll_in": max(0.0, self.next_poll_at - time.monotonic()) if self.next_poll_at else None,
+            }
+
+    @staticmethod
+    def state_of(status) -> Optional[str]:
+        """Extract the lower-cased state name from a status payload"""
+        if isinstance(status, dict):
+            state = status.get("status") or status.get("state")
+            return str(state).lower() if state is not None else None
+        return None
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_duration
+        delay = self.initial_delay
+        last_state = None
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            status, error = self.fetch()
+            state = self.state_of(status)
+            with self._lock:
+                self.polls += 1
+                self.error = error
+                if status is not None:
+                    self.status = status
+            if state in TERMINAL_INTAKE_STATES:
+                break
+
+            if error is None and state is not None and state != last_state:
+                delay = self.initial_delay
+                last_state = state
+            else:
+                # A failed poll tells nothing about the state, so it backs off instead of resetting
+                delay = min(self.max_delay, delay * self.multiplier)
+            wait = delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            with self._lock:
+                self.next_poll_at = time.monotonic() + wait
+            self._stop.wait(wait)
+        with self._lock:
+            self.next_poll_at = None
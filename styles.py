@@ -0,0 +1,38 @@
+import hashlib
+import re
+from pathlib import Path
+
+import streamlit as st
+
+APP_DIR = Path(__file__).parent
+STYLES_DIR = APP_DIR / "styles"
+# Served by Streamlit at app/static/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = APP_DIR / "static"
+
+# Source stylesheets, merged in this order
+STYLESHEETS = ["app.css", "intakes_history.css"]
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+@st.cache_resource
+def build_stylesheet() -> str:
+    """Merge, minify and content-hash the app CSS once per process and return its URL"""
+    css = minify_css("\n".join((STYLES_DIR / name).read_text(encoding="utf-8") for name in STYLESHEETS))
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    file_name = f"app.{digest}.css"
+
+    STATIC_DIR.mkdir(exist_ok=True)
+    path = STATIC_DIR / file_name
+    if not path.exists():
+        path.write_text(css, encoding="utf-8")
+    return f"app/static/{file_name}"
+
+def inject_styles():
+    """Reference the compiled stylesheet; the browser downloads and caches it once"""
+    st.markdown(f'<link rel="stylesheet" href="{build_stylesheet()}">', unsafe_allow_html=True)
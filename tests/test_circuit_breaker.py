@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+import api_client
+from api_client import CircuitBreaker, CircuitOpenError
+
+URL = "http://pulse.test/api/query"
+
+class FakeSession:
+    """Stands in for the pooled session, raising the queued exceptions in order"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        raise self.errors.pop(0)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api_client.time, "monotonic", lambda: now[0])
+    return now
+
+def send(monkeypatch, breaker, session):
+    monkeypatch.setattr(api_client, "get_session", lambda url: session)
+    api_client._send("query_insights", "POST", URL, breaker)
+
+def test_probe_error_reopens_breaker(monkeypatch, clock):
+    breaker = CircuitBreaker("pulse.test", failure_threshold=2, reset_timeout=30)
+    session = FakeSession(requests.ConnectionError("down"), requests.Timeout("slow"),
+                          ValueError("bad response"), requests.ConnectionError("still down"))
+
+    # closed -> open after failure_threshold failures
+    for _ in range(2):
+        with pytest.raises(requests.RequestException):
+            send(monkeypatch, breaker, session)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        send(monkeypatch, breaker, session)
+    assert session.calls == 2
+
+    # open -> half-open; the probe fails with an exception that is not a network error
+    clock[0] += 30
+    assert breaker.state == "half-open"
+    with pytest.raises(ValueError):
+        send(monkeypatch, breaker, session)
+    assert breaker.state == "open"
+
+    # The failed probe reopened the breaker instead of leaving it stuck mid-probe
+    clock[0] += 30
+    assert breaker.state == "half-open"
+    with pytest.raises(requests.ConnectionError):
+        send(monkeypatch, breaker, session)
+    assert session.calls == 4
+
+def test_successful_probe_closes_breaker(monkeypatch, clock):
+    breaker = CircuitBreaker("pulse.test", failure_threshold=1, reset_timeout=30)
+    with pytest.raises(ValueError):
+        send(monkeypatch, breaker, FakeSession(ValueError("bad response")))
+    assert breaker.state == "open"
+
+    clock[0] += 30
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+def test_rejected_requests_are_not_recorded_as_calls(monkeypatch, clock):
+    breaker = CircuitBreaker("pulse.test", failure_threshold=1, reset_timeout=30)
+    monkeypatch.setattr(api_client.metrics, "registry", api_client.metrics.MetricsRegistry())
+    with pytest.raises(requests.ConnectionError):
+        send(monkeypatch, breaker, FakeSession(requests.ConnectionError("down")))
+    with pytest.raises(CircuitOpenError):
+        send(monkeypatch, breaker, FakeSession())
+    assert api_client.metrics.registry.snapshot()["query_insights"]["count"] == 1
@@ -0,0 +1,26 @@
+import functools
+import re
+
+# Words per minute used for the estimated read time
+READING_WORDS_PER_MINUTE = 200
+TEXT_STATS_CACHE_SIZE = 16
+
+_WORD = re.compile(r"\S+")
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words like len(text.split()), without building the list of words"""
+    count = 0
+    for _ in _WORD.finditer(text):
+        count += 1
+    return count
+
+@functools.lru_cache(maxsize=TEXT_STATS_CACHE_SIZE)
+def text_stats(text: str) -> dict:
+    """Character count, word count and read time of a text, memoized by content (str hashes are cached per object)"""
+    words = count_words(text)
+    return {
+        "has_content": bool(text) and not text.isspace(),
+        "characters": len(text),
+        "words": words,
+        "read_minutes": max(1, words // READING_WORDS_PER_MINUTE),
+    }
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Local SQLite file recording the content hash of everything each org has uploaded
+UPLOAD_INDEX_PATH = os.environ.get("PULSE_UPLOAD_INDEX_DB", os.path.join(".pulse", "upload_index.sqlite3"))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploaded_content (
+    org_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    intake_id TEXT NOT NULL,
+    name TEXT,
+    size INTEGER,
+    uploaded_at REAL NOT NULL,
+    finalized_at REAL,
+    PRIMARY KEY (org_id, content_hash, intake_id)
+);
+CREATE INDEX IF NOT EXISTS uploaded_content_intake ON uploaded_content (org_id, intake_id);
+"""
+
+def hash_file(file_obj, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 of a file object, read in chunks and rewound afterwards"""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+def hash_text(text: str) -> str:
+    """SHA-256 of text as UTF-8, so a paste matches the same transcript uploaded as a .txt file"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class UploadIndex:
+    """Per-org index of uploaded content hashes and the intakes they went into, stored in SQLite"""
+
+    def __init__(self, path: str = UPLOAD_INDEX_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def lookup(self, org_id, content_hash: str) -> list[dict]:
+        """Earlier uploads of this content by the org, most recent first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT intake_id, name, size, uploaded_at, finalized_at FROM uploaded_content "
+                "WHERE org_id = ? AND content_hash = ? ORDER BY uploaded_at DESC",
+                (str(org_id), content_hash),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def record(self, org_id, content_hash: str, intake_id: str, name: Optional[str] = None, size: Optional[int] = None):
+        """Remember a successful upload of content into an intake"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded_content (org_id, content_hash, intake_id, name, size, uploaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(org_id), content_hash, str(intake_id), name, size, time.time()),
+            )
+
+    def mark_finalized(self, org_id, intake_id: str):
+        """Flag every upload of an intake as part of the knowledge base"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE uploaded_content SET finalized_at = ? WHERE org_id = ? AND intake_id = ? AND finalized_at IS NULL",
+                (time.time(), str(org_id), str(intake_id)),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def find_duplicate(earlier: list, intake_id: str) -> tuple[Optional[str], Optional[dict]]:
+    """Classify content against its earlier uploads as ("same_intake" | "finalized" | "pending", upload) or (None, None)"""
+    for kind, matches in (
+        ("same_intake", lambda upload: upload["intake_id"] == str(intake_id)),
+        ("finalized", lambda upload: upload["finalized_at"] is not None),
+        ("pending", lambda upload: True),
+    ):
+        for upload in earlier:
+            if matches(upload):
+                return kind, upload
+    return None, None
@@ -0,0 +1,281 @@
+import os
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+import api_client
+import metrics
+
+# Size of each read from an uploaded file while streaming it to the API
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def _quote_param(value: str) -> str:
+    """Escape a value for use in a quoted Content-Disposition parameter"""
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+class MultipartFileStream:
+    """Multipart/form-data body for one file field, streamed in fixed-size chunks"""
+
+    def __init__(self, field_name: str, file_name: str, file_obj, content_type: Optional[str] = None,
+                 size: Optional[int] = None, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.size = size if size is not None else self._file_size(file_obj)
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote_param(field_name)}"; filename="{_quote_param(file_name)}"\r\n'
+            f"Content-Type: {content_type or 'application/octet-stream'}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    @staticmethod
+    def _file_size(file_obj) -> int:
+        """Get the size of a seekable file object without reading it"""
+        position = file_obj.tell()
+        size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+        return size
+
+    def __len__(self) -> int:
+        # Lets requests send a Content-Length header instead of chunked encoding
+        return len(self._head) + self.size + len(self._tail)
+
+    def __iter__(self):
+        yield self._head
+        self.file_obj.seek(0)
+        while True:
+            chunk = self.file_obj.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        yield self._tail
+
+# Files above this size are sent in parts instead of a single POST when chunked uploads are enabled.
+# They need /parts/{n} and /complete routes under the file upload URL, which the Pulse API is not known
+# to provide (mock_server.py has them), so they are opt-in with PULSE_CHUNKED_UPLOADS=1.
+CHUNKED_UPLOADS_ENABLED = os.environ.get("PULSE_CHUNKED_UPLOADS", "").lower() in ("1", "true", "yes")
+CHUNKED_UPLOAD_THRESHOLD = 4 * 1024 * 1024
+UPLOAD_PART_SIZE = 2 * 1024 * 1024
+UPLOAD_PART_WORKERS = 4
+# Answers to a part upload meaning the server has no part API; the file is then sent in one POST
+PART_API_MISSING_STATUSES = {404, 405}
+_parts_unsupported_hosts = set()
+
+def use_chunked_upload(file_url: str, size: int) -> bool:
+    """Whether a file of this size should be sent in parts to the given upload URL"""
+    return (CHUNKED_UPLOADS_ENABLED and size > CHUNKED_UPLOAD_THRESHOLD
+            and urlsplit(file_url).netloc not in _parts_unsupported_hosts)
+
+class ChunkedUpload:
+    """Progress of a chunked file upload, kept between attempts so it can resume"""
+
+    def __init__(self, upload_id: str, file_name: str, content_type: Optional[str], size: int,
+                 part_size: int = UPLOAD_PART_SIZE):
+        self.upload_id = upload_id
+        self.file_name = file_name
+        self.content_type = content_type or "application/octet-stream"
+        self.size = size
+        self.part_size = part_size
+        self.part_count = max(1, -(-size // part_size))
+        self.acknowledged = set()
+        self.unsupported = False  # set when the server has no part API
+        self._lock = threading.Lock()
+
+    def matches(self, file_name: str, size: int) -> bool:
+        """Check whether this upload state belongs to the given file"""
+        return self.file_name == file_name and self.size == size
+
+    def pending_parts(self) -> list:
+        """Part numbers that the server has not acknowledged yet"""
+        with self._lock:
+            return [n for n in range(self.part_count) if n not in self.acknowledged]
+
+    def acknowledge(self, part_number: int):
+        """Record a part as received by the server"""
+        with self._lock:
+            self.acknowledged.add(part_number)
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.acknowledged) == self.part_count
+
+    def part_idempotency_key(self, part_number: int) -> str:
+        """Idempotency key for one part, derived from the upload's key"""
+        return f"{self.upload_id}-part-{part_number}"
+
+def _read_part(file_obj, file_lock, offset: int, length: int) -> bytes:
+    """Read one part of a shared file object"""
+    with file_lock:
+        file_obj.seek(offset)
+        return file_obj.read(length)
+
+def _send_part(upload: ChunkedUpload, file_obj, file_lock, parts_url: str, headers: dict, part_number: int):
+    """Upload a single part and return None on success or an error message"""
+    offset = part_number * upload.part_size
+    data = _read_part(file_obj, file_lock, offset, upload.part_size)
+    part_headers = dict(headers)
+    part_headers.update({
+        "x-idempotency-key": upload.part_idempotency_key(part_number),
+        "x-upload-id": upload.upload_id,
+        "x-part-count": str(upload.part_count),
+        "x-part-offset": str(offset),
+        "Content-Type": "application/octet-stream",
+    })
+    try:
+        response = api_client.post("upload_part", f"{parts_url}/{part_number}", headers=part_headers, data=data)
+    except Exception as e:
+        return f"part {part_number}: {str(e)}"
+    if response.status_code == 200:
+        upload.acknowledge(part_number)
+        return None
+    if response.status_code in PART_API_MISSING_STATUSES:
+        upload.unsupported = True
+    return f"part {part_number}: {response.status_code}"
+
+def upload_parts(upload: ChunkedUpload, file_obj, file_url: str, headers: dict,
+                 max_workers: int = UPLOAD_PART_WORKERS) -> list:
+    """Send all unacknowledged parts concurrently and return the error messages of failed parts"""
+    pending = upload.pending_parts()
+    if not pending:
+        return []
+    parts_url = f"{file_url}/parts"
+    file_lock = threading.Lock()
+    errors = []
+    if not upload.acknowledged:
+        # Send one part alone first, so a server without the part API costs a single request
+        error = _send_part(upload, file_obj, file_lock, parts_url, headers, pending[0])
+        if upload.unsupported:
+            _parts_unsupported_hosts.add(urlsplit(file_url).netloc)
+            return [error]
+        if error:
+            errors.append(error)
+        pending = pending[1:]
+        if not pending:
+            return errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        futures = [
+            executor.submit(_send_part, upload, file_obj, file_lock, parts_url, headers, n)
+            for n in pending
+        ]
+        for future in as_completed(futures):
+            error = future.result()
+            if error:
+                errors.append(error)
+    return errors
+
+def complete_chunked_upload(upload: ChunkedUpload, file_url: str, headers: dict):
+    """Ask the server to assemble the acknowledged parts into the uploaded file"""
+    complete_headers = dict(headers)
+    complete_headers["x-idempotency-key"] = upload.upload_id
+    payload = {
+        "upload_id": upload.upload_id,
+        "file_name": upload.file_name,
+        "content_type": upload.content_type,
+        "size": upload.size,
+        "part_count": upload.part_count,
+    }
+    return api_client.post("complete_upload", f"{file_url}/complete", headers=complete_headers, json=payload)
+
+# Request-body compression for text uploads: "gzip", "deflate" or "identity" (off, the default).
+# Opt in with PULSE_UPLOAD_ENCODING once the API is known to decode request bodies.
+UPLOAD_CONTENT_ENCODING = os.environ.get("PULSE_UPLOAD_ENCODING", "identity").lower()
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_LEVEL = 6
+COMPRESSIBLE_EXTENSIONS = (".txt", ".md", ".markdown", ".vtt", ".srt", ".csv", ".json", ".log")
+# Answer to an encoded request meaning the server does not accept the Content-Encoding; the body is resent uncompressed.
+# Other 4xx answers are ordinary validation failures and are returned as they are.
+REJECTED_ENCODING_STATUSES = {415}
+_encoding_rejected_hosts = set()
+
+def compression_enabled() -> bool:
+    return UPLOAD_CONTENT_ENCODING in ("gzip", "deflate")
+
+def is_compressible(file_name: str, content_type: Optional[str]) -> bool:
+    """Whether a file is text that is worth compressing before upload"""
+    return (content_type or "").startswith("text/") or file_name.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+def _compressor(encoding: str):
+    # wbits 31 writes a gzip header and trailer, 15 the zlib format that HTTP's deflate expects
+    return zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31 if encoding == "gzip" else 15)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Encode a request body with gzip or deflate"""
+    compressor = _compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+class CompressedStream:
+    """gzip or deflate encoding of a re-iterable body, compressed chunk by chunk while it is sent.
+
+    Each iteration starts over from the source, so the body can be retried. It has
+    no length, so requests sends it with chunked transfer encoding.
+    """
+
+    def __init__(self, source, encoding: str):
+        self.source = source
+        self.encoding = encoding
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    def __iter__(self):
+        compressor = _compressor(self.encoding)
+        self.input_bytes = self.output_bytes = 0
+        for chunk in self.source:
+            self.input_bytes += len(chunk)
+            data = compressor.compress(chunk)
+            if data:
+                self.output_bytes += len(data)
+                yield data
+        data = compressor.flush()
+        self.output_bytes += len(data)
+        yield data
+
+def post_maybe_compressed(endpoint: str, url: str, headers: dict, body, size: Optional[int] = None):
+    """POST a body (bytes, or a re-iterable stream of size bytes) compressed when enabled and accepted by the host.
+
+    If the server rejects the encoded request, the body is resent uncompressed.
+    """
+    size = len(body) if size is None else size
+    host = urlsplit(url).netloc
+    if not compression_enabled() or size < COMPRESSION_MIN_BYTES or host in _encoding_rejected_hosts:
+        return api_client.post(endpoint, url, headers=headers, data=body)
+
+    if isinstance(body, bytes):
+        encoded = compress(body, UPLOAD_CONTENT_ENCODING)
+        if len(encoded) >= len(body):
+            return api_client.post(endpoint, url, headers=headers, data=body)
+    else:
+        encoded = CompressedStream(body, UPLOAD_CONTENT_ENCODING)
+    encoded_headers = dict(headers)
+    encoded_headers["Content-Encoding"] = UPLOAD_CONTENT_ENCODING
+    response = api_client.post(endpoint, url, headers=encoded_headers, data=encoded)
+    if response.status_code not in REJECTED_ENCODING_STATUSES:
+        if isinstance(encoded, CompressedStream):
+            metrics.registry.observe_compression(endpoint, encoded.input_bytes, encoded.output_bytes)
+        else:
+            metrics.registry.observe_compression(endpoint, len(body), len(encoded))
+        return response
+
+    # Remember the rejection so later uploads to this host skip the wasted attempt
+    _encoding_rejected_hosts.add(host)
+    return api_client.post(endpoint, url, headers=headers, data=body)
+
+def post_text(text_url: str, text_content: str, headers: dict):
+    """POST text as the text_content form field, compressed when possible"""
+    form_headers = dict(headers)
+    form_headers["Content-Type"] = "application/x-www-form-urlencoded"
+    body = urlencode({"text_content": text_content}).encode("ascii")
+    return post_maybe_compressed("upload_text", text_url, form_headers, body)
+
+def post_file(file_url: str, uploaded_file, headers: dict):
+    """POST a file as multipart/form-data, streamed in chunks and compressed on the fly when it is text"""
+    body = MultipartFileStream("file", uploaded_file.name, uploaded_file, uploaded_file.type, uploaded_file.size)
+    file_headers = dict(headers)
+    file_headers["Content-Type"] = body.content_type
+    if is_compressible(uploaded_file.name, uploaded_file.type):
+        return post_maybe_compressed("upload_file", file_url, file_headers, body, len(body))
+    return api_client.post("upload_file", file_url, headers=file_headers, data=body)